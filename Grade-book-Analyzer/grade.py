@@ -5,8 +5,17 @@
 # Purpose: Analyse and report student grades from input or CSV
 
 
+import argparse
 import csv
+import glob
+import itertools
+import math
+import os
 import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 
 #Menu
@@ -16,7 +25,8 @@ def print_menu():
     print("\n===== GRADEBOOK ANALYZER =====")        
     print("1. Enter student data manually")
     print("2. Load student data from CSV")
-    print("3. Exit")
+    print("3. Summarise a large CSV (streaming)")
+    print("4. Exit")
     print("==============================")
 
 
@@ -35,19 +45,44 @@ def manual_input():
     return marks
 
 
+def parse_row(row):
+    """(name, score) from a CSV row; raises ValueError saying what is wrong."""
+    if len(row) < 2:
+        raise ValueError("expected name and marks")
+    if not row[0].strip():
+        raise ValueError("missing name")
+    score = float(row[1])
+    if not math.isfinite(score):
+        raise ValueError(f"marks must be a finite number, got {row[1]!r}")
+    return row[0], score
+
+
+def read_marks(filename):
+    """({name: score}, bad rows) from a Name,Marks CSV file."""
+    marks = {}
+    bad_rows = []
+    with open(filename, "r", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for line, row in enumerate(reader, start=2):
+            try:
+                name, score = parse_row(row)
+            except ValueError as e:
+                bad_rows.append((line, row, str(e)))
+                continue
+            marks[name] = score
+    return marks, bad_rows
+
+
 def load_from_csv():                       
     filename = input("Enter CSV filename (example: marks.csv): ")
 
     marks = {}
+    bad_rows = []
     try:
-        with open(filename, "r") as f:
-            reader = csv.reader(f)
-            next(reader)  
-            for row in reader:
-                name = row[0]
-                score = float(row[1])
-                marks[name] = score
+        marks, bad_rows = read_marks(filename)
         print("CSV loaded successfully!")
+        print_bad_rows(len(bad_rows), bad_rows)
     except FileNotFoundError:               
         print("File not found!")
     except Exception as e:
@@ -116,6 +151,339 @@ def pass_fail_lists(marks):
     return passed, failed
 
 
+#Vectorized Engine
+# Same results as the functions above, computed on arrays in one pass
+# for cohorts with millions of students.
+
+
+GRADE_CUTOFFS = np.array([40, 60, 70, 80, 90])   # lower bound of E, D, C, B, A
+GRADE_LETTERS = np.array(["F", "E", "D", "C", "B", "A"])
+PASS_MARK = 40
+
+
+def grade_codes(scores):
+    """Index into GRADE_LETTERS for each score (binned lookup, no if/elif)."""
+    codes = np.searchsorted(GRADE_CUTOFFS, scores, side="right")
+    codes[np.isnan(scores)] = 0      # NaN fails every >= test in assign_grades
+    return codes
+
+
+def analyse_arrays(names, scores):
+    """Every statistic of the menu report from parallel name / score arrays.
+
+    Matches the dict-based functions exactly: the average is summed left to
+    right like sum(), ties for max/min go to the first student, and a NaN
+    score is graded F but counted neither as pass nor fail.
+    """
+    names = np.asarray(names, dtype=object)
+    scores = np.asarray(scores, dtype=np.float64)
+    if len(scores) == 0:
+        raise ValueError("No marks to analyse")
+
+    codes = grade_codes(scores)
+    counts = np.bincount(codes, minlength=len(GRADE_LETTERS))
+
+    n = len(scores)
+    ordered = np.partition(scores, [(n - 1) // 2, n // 2])
+    lo, hi = ordered[(n - 1) // 2], ordered[n // 2]
+    median = lo if n % 2 else (lo + hi) / 2
+
+    top, bottom = np.argmax(scores), np.argmin(scores)
+    return {
+        "average": np.cumsum(scores)[-1].item() / n,
+        "median": median.item(),
+        "max": (names[top], scores[top].item()),
+        "min": (names[bottom], scores[bottom].item()),
+        "codes": codes,
+        "distribution": {g: counts[i].item() for i, g in reversed(list(enumerate(GRADE_LETTERS.tolist())))},
+        "passed": names[scores >= PASS_MARK].tolist(),
+        "failed": names[scores < PASS_MARK].tolist(),
+    }
+
+
+def analyse(marks):
+    """analyse_arrays() for a {name: score} dict; also returns the grades dict."""
+    result = analyse_arrays(list(marks), np.fromiter(marks.values(), dtype=np.float64, count=len(marks)))
+    result["grades"] = dict(zip(marks, GRADE_LETTERS[result["codes"]].tolist()))
+    return result
+
+
+#Percentiles
+# Sorted, compressed index over scores: each distinct score is stored once
+# with its count, plus a running (cumulative) count, so median, quantile
+# and percentile-rank queries are a binary search instead of a sort.
+
+
+class ScoreIndex:
+    """Distinct scores with counts, answering order queries in O(log d).
+
+    d is the number of distinct scores, which for marks is small however
+    many students there are. Inserting a score already in the index is a
+    vectorized update of the running counts; a new score only marks the
+    index for rebuilding at the next query. If d exceeds `max_distinct`
+    (e.g. unrounded scores from a huge cohort) scores are rounded to a
+    coarser `resolution` (0.01, 0.1, 1, ...) and answers become
+    approximate to within resolution / 2.
+    """
+
+    def __init__(self, max_distinct=100_000):
+        self.counts = {}
+        self.n = 0
+        self.max_distinct = max_distinct
+        self.resolution = None
+        self._values = None    # sorted distinct scores
+        self._cum = None       # _cum[i] = number of scores <= _values[i]
+
+    def __len__(self):
+        return self.n
+
+    def add(self, scores):
+        """Inserts one score or an array of scores."""
+        scores = np.atleast_1d(np.asarray(scores, dtype=np.float64))
+        if self.resolution is not None:
+            scores = np.round(scores / self.resolution) * self.resolution
+        values, counts = np.unique(scores, return_counts=True)
+        for value, count in zip(values.tolist(), counts.tolist()):
+            if value in self.counts:
+                if self._values is not None:
+                    self._cum[np.searchsorted(self._values, value):] += count
+            else:
+                self._values = None
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.n += len(scores)
+        if len(self.counts) > self.max_distinct:
+            self.compress()
+
+    def merge(self, other):
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.n += other.n
+        self._values = None
+        if len(self.counts) > self.max_distinct:
+            self.compress()
+        return self
+
+    def compress(self):
+        """Rounds scores to a coarser resolution until max_distinct fits."""
+        while len(self.counts) > self.max_distinct:
+            self.resolution = 0.01 if self.resolution is None else self.resolution * 10
+            counts = {}
+            for value, count in self.counts.items():
+                value = round(value / self.resolution) * self.resolution
+                counts[value] = counts.get(value, 0) + count
+            self.counts = counts
+        self._values = None
+
+    def _index(self):
+        if self._values is None:
+            self._values = np.array(sorted(self.counts), dtype=np.float64)
+            self._cum = np.cumsum([self.counts[v] for v in self._values.tolist()], dtype=np.int64)
+        return self._values, self._cum
+
+    def nth(self, k):
+        """The k-th smallest score (0-based)."""
+        if not 0 <= k < self.n:
+            raise IndexError(k)
+        values, cum = self._index()
+        return values[np.searchsorted(cum, k, side="right")].item()
+
+    def median(self):
+        """Same value as statistics.median over all inserted scores."""
+        lo, hi = self.nth((self.n - 1) // 2), self.nth(self.n // 2)
+        return lo if self.n % 2 else (lo + hi) / 2
+
+    def quantile(self, q):
+        """q-th quantile (0 <= q <= 1), interpolated like numpy.quantile."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        position = q * (self.n - 1)
+        below = math.floor(position)
+        lo = self.nth(below)
+        if position == below:
+            return lo
+        return lo + (self.nth(below + 1) - lo) * (position - below)
+
+    def percentile_rank(self, score):
+        """Percent of scores below `score`, counting equal scores as half."""
+        if self.n == 0:
+            raise ValueError("No marks to rank against")
+        if self.resolution is not None:
+            score = round(score / self.resolution) * self.resolution
+        values, cum = self._index()
+        below = np.searchsorted(values, score, side="left")
+        at_most = np.searchsorted(values, score, side="right")
+        count_below = cum[below - 1] if below else 0
+        count_at_most = cum[at_most - 1] if at_most else 0
+        return 100 * (count_below + (count_at_most - count_below) / 2) / self.n
+
+
+def score_index(marks_dict):
+    index = ScoreIndex()
+    index.add(np.fromiter(marks_dict.values(), dtype=np.float64, count=len(marks_dict)))
+    return index
+
+
+def percentile_rank(marks_dict, name, index=None):
+    """A student's percentile rank in the class (pass a prebuilt index to reuse it)."""
+    return (index if index is not None else score_index(marks_dict)).percentile_rank(marks_dict[name])
+
+
+#Streaming Loader
+# Summarises grade files too large to hold in memory: rows are read in
+# chunks and folded into running aggregates, then dropped.
+
+
+class GradeSummary:
+    """Running count / sum / min / max / grade counts / pass-fail of a stream.
+
+    Every valid row counts as one record (names are not de-duplicated,
+    which would need them all in memory). Bad rows are counted, and the
+    first `max_bad_rows` are kept for the report.
+    """
+
+    def __init__(self, max_bad_rows=1000):
+        self.count = 0
+        self.total = 0.0
+        self.max = self.min = None
+        self.counts = np.zeros(len(GRADE_LETTERS), dtype=np.int64)
+        self.passed = self.failed = 0
+        self.scores = ScoreIndex()
+        self.max_bad_rows = max_bad_rows
+        self.bad_count = 0
+        self.bad_rows = []
+
+    def add(self, names, scores):
+        scores = np.asarray(scores, dtype=np.float64)
+        if len(scores) == 0:
+            return
+        # left-to-right running sum, so the average matches calculate_average
+        self.total = np.cumsum(np.concatenate(([self.total], scores)))[-1].item()
+        self.count += len(scores)
+        top, bottom = np.argmax(scores), np.argmin(scores)
+        if self.max is None or scores[top] > self.max[1]:
+            self.max = (names[top], scores[top].item())
+        if self.min is None or scores[bottom] < self.min[1]:
+            self.min = (names[bottom], scores[bottom].item())
+        self.counts += np.bincount(grade_codes(scores), minlength=len(GRADE_LETTERS))
+        passed = int(np.count_nonzero(scores >= PASS_MARK))
+        self.passed += passed
+        self.failed += len(scores) - passed
+        self.scores.add(scores)
+
+    def merge(self, other):
+        """Folds in another summary, e.g. one section into the cohort."""
+        self.total += other.total
+        self.count += other.count
+        if other.max is not None and (self.max is None or other.max[1] > self.max[1]):
+            self.max = other.max
+        if other.min is not None and (self.min is None or other.min[1] < self.min[1]):
+            self.min = other.min
+        self.counts += other.counts
+        self.passed += other.passed
+        self.failed += other.failed
+        self.scores.merge(other.scores)
+        self.bad_count += other.bad_count
+        self.bad_rows.extend(other.bad_rows[:self.max_bad_rows - len(self.bad_rows)])
+        return self
+
+    def add_bad(self, line, row, reason):
+        self.bad_count += 1
+        if len(self.bad_rows) < self.max_bad_rows:
+            self.bad_rows.append((line, row, reason))
+
+    def average(self):
+        return self.total / self.count
+
+    def median(self):
+        return self.scores.median()
+
+    def distribution(self):
+        return {g: self.counts[i].item() for i, g in reversed(list(enumerate(GRADE_LETTERS.tolist())))}
+
+
+def stream_csv(filename, chunksize=100_000, max_bad_rows=1000):
+    """GradeSummary of a Name,Marks CSV, read `chunksize` rows at a time."""
+    summary = GradeSummary(max_bad_rows)
+    with open(filename, "r", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        line = 1
+        while True:
+            rows = list(itertools.islice(reader, chunksize))
+            if not rows:
+                break
+            names, scores = [], []
+            for row in rows:
+                line += 1
+                try:
+                    name, score = parse_row(row)
+                except ValueError as e:
+                    summary.add_bad(line, row, str(e))
+                    continue
+                names.append(name)
+                scores.append(score)
+            summary.add(names, scores)
+    return summary
+
+
+def write_bad_rows(summary, filename):
+    """Side report of the kept bad rows: line number, reason and the raw row."""
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Line", "Reason", "Row"])
+        for line, row, reason in summary.bad_rows:
+            writer.writerow([line, reason, ",".join(row)])
+
+
+def print_bad_rows(count, bad_rows, limit=5):
+    if not count:
+        return
+    print(f"Skipped {count} bad row(s):")
+    for line, row, reason in bad_rows[:limit]:
+        print(f"  line {line}: {reason} {row}")
+    if count > limit:
+        print(f"  ... and {count - limit} more")
+
+
+def print_summary(summary):
+    if summary.count == 0:
+        print("No valid rows found.")
+        return
+    print("\n----- STATISTICAL SUMMARY -----")
+    print(f"Students:      {summary.count}")
+    print(f"Average Score: {summary.average():.2f}")
+    print(f"Median Score:  {summary.median():.2f}")
+    print(f"Highest Score: {summary.max[0]} ({summary.max[1]})")
+    print(f"Lowest Score:  {summary.min[0]} ({summary.min[1]})")
+
+    print("\n----- GRADE DISTRIBUTION -----")
+    for grade, count in summary.distribution().items():
+        print(f"{grade}: {count}")
+
+    print("\n----- PERCENTILES -----")
+    for q in (0.10, 0.25, 0.75, 0.90):
+        print(f"P{int(q * 100)}: {summary.scores.quantile(q):.2f}")
+
+    print("\n----- PASS / FAIL -----")
+    print(f"Passed: {summary.passed}")
+    print(f"Failed: {summary.failed}")
+
+
+def summarise_large_csv():
+    filename = input("Enter CSV filename (example: marks.csv): ")
+    try:
+        summary = stream_csv(filename)
+    except FileNotFoundError:
+        print("File not found!")
+        return
+    print_bad_rows(summary.bad_count, summary.bad_rows)
+    if summary.bad_count:
+        report = filename + ".bad_rows.csv"
+        write_bad_rows(summary, report)
+        print(f"Bad rows written to {report}")
+    print_summary(summary)
+
+
 #Formatted Table
 
 
@@ -127,24 +495,109 @@ def print_table(marks, grades):
     print("--------------------------------------")
 
 
-def export_csv(marks, grades):       
-    filename = "studentgrades.csv"
+def export_csv(marks, grades, filename="studentgrades.csv", quiet=False):       
     with open(filename, "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["Name", "Marks", "Grade"])
         for name in marks:
             writer.writerow([name, marks[name], grades[name]])
-    print(f"Results exported to {filename}")
+    if not quiet:
+        print(f"Results exported to {filename}")
 
 
 
 
+#Batch Mode
+# Non-interactive: python grade.py --batch sections/ --out results/ --workers 8
+
+
+SUMMARY_FIELDS = ["Section", "Students", "Average", "Median", "Highest", "Lowest",
+                  "A", "B", "C", "D", "E", "F", "Passed", "Failed", "Bad Rows", "Error"]
+
+
+def section_files(pattern):
+    """Section CSVs from a directory (every *.csv in it) or a glob pattern."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.csv")
+    return sorted(glob.glob(pattern))
+
+
+def grade_section(filename, out_dir):
+    """Grades one section file; writes <section>_grades.csv (and
+    <section>_bad_rows.csv if needed). Returns (section, GradeSummary, None),
+    or (section, None, error) if the file could not be graded."""
+    section = os.path.splitext(os.path.basename(filename))[0]
+    try:
+        marks, bad_rows = read_marks(filename)
+        summary = GradeSummary()
+        for line, row, reason in bad_rows:
+            summary.add_bad(line, row, reason)
+        if marks:
+            result = analyse(marks)
+            export_csv(marks, result["grades"], os.path.join(out_dir, f"{section}_grades.csv"), quiet=True)
+            summary.add(list(marks), np.fromiter(marks.values(), dtype=np.float64, count=len(marks)))
+        if bad_rows:
+            write_bad_rows(summary, os.path.join(out_dir, f"{section}_bad_rows.csv"))
+    except Exception as e:
+        return section, None, f"{type(e).__name__}: {e}"
+    return section, summary, None
+
+
+def summary_row(section, summary, error=""):
+    if summary is None:  # the section failed
+        return [section] + [""] * (len(SUMMARY_FIELDS) - 2) + [error]
+    row = [section, summary.count]
+    if summary.count:
+        row += [f"{summary.average():.2f}", f"{summary.median():.2f}",
+                f"{summary.max[0]} ({summary.max[1]})", f"{summary.min[0]} ({summary.min[1]})"]
+    else:
+        row += ["", "", "", ""]
+    return row + list(summary.distribution().values()) + [summary.passed, summary.failed, summary.bad_count, error]
+
+
+def run_batch(pattern, out_dir, workers=None):
+    """Grades every section in a worker pool and writes section_summary.csv
+    and cohort_summary.csv to `out_dir`. A section that cannot be graded is
+    listed with its error and left out of the cohort; the others still run.
+    Returns the merged cohort summary."""
+    files = section_files(pattern)
+    if not files:
+        print(f"No CSV files match {pattern}")
+        return None
+    os.makedirs(out_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    cohort = GradeSummary()
+    failed = []
+    with open(os.path.join(out_dir, "section_summary.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_FIELDS)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(grade_section, files, itertools.repeat(out_dir), chunksize=8)
+            for section, summary, error in results:
+                writer.writerow(summary_row(section, summary, error or ""))
+                if error is not None:
+                    print(f"Failed to grade {section}: {error}")
+                    failed.append(section)
+                    continue
+                cohort.merge(summary)
+    with open(os.path.join(out_dir, "cohort_summary.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_FIELDS)
+        writer.writerow(summary_row("Cohort", cohort, f"{len(failed)} section(s) failed" if failed else ""))
+    seconds = time.perf_counter() - start
+
+    print(f"Graded {len(files) - len(failed)} of {len(files)} section(s), {cohort.count} students "
+          f"({cohort.bad_count} bad rows) in {seconds:.2f} s")
+    print(f"Throughput: {len(files) / seconds:.1f} sections/s, {cohort.count / seconds:,.0f} students/s")
+    print(f"Results written to {out_dir}")
+    return cohort
 
 
 def main():    
     while True:
         print_menu()
-        choice = input("Choose an option (1–3): ")
+        choice = input("Choose an option (1–4): ")
 
         if choice == "1":   
             marks = manual_input()
@@ -154,7 +607,11 @@ def main():
             if not marks:
                 continue
 
-        elif choice == "3":   
+        elif choice == "3":
+            summarise_large_csv()
+            continue
+
+        elif choice == "4":   
             print("Exiting... Goodbye!")
             break
 
@@ -163,14 +620,14 @@ def main():
             continue
 
        
-        avg = calculate_average(marks)
-        med = calculate_median(marks)
-        max_name, max_score = find_max_score(marks)
-        min_name, min_score = find_min_score(marks)
+        result = analyse(marks)
+        avg, med = result["average"], result["median"]
+        max_name, max_score = result["max"]
+        min_name, min_score = result["min"]
 
-        grades = assign_grades(marks)
-        dist = grade_distribution(grades)
-        passed, failed = pass_fail_lists(marks)
+        grades = result["grades"]
+        dist = result["distribution"]
+        passed, failed = result["passed"], result["failed"]
 
         #results
         print("\n----- STATISTICAL SUMMARY -----")
@@ -197,4 +654,13 @@ def main():
 
 # Run program
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="GradeBook Analyzer (interactive menu when run without --batch)")
+    parser.add_argument("--batch", metavar="DIR_OR_GLOB", help="grade every section CSV in a directory or glob")
+    parser.add_argument("--out", default="results", help="output directory for --batch (default: results)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.batch:
+        run_batch(args.batch, args.out, args.workers)
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,215 @@
+# benchmark.py
+# Timing checks for the scalable code paths of dashboard.py
+#
+# Usage: python benchmark.py [name ...]     (no name → run all)
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import dashboard
+
+BUILDINGS = ["Library", "Admin", "Hostel", "Lab", "Gym"]
+
+
+# ------------------------------------------------------------
+# HELPERS
+# ------------------------------------------------------------
+def write_meter_file(path, building, start, periods, freq="15min", seed=0, decimals=2):
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range(start, periods=periods, freq=freq)
+    kwh = rng.uniform(5, 50, periods).round(decimals)
+    pd.DataFrame({
+        "timestamp": ts.strftime("%Y-%m-%d %H:%M"),
+        "kwh": kwh if decimals else kwh.astype(np.int64),
+        "building": building,
+    }).to_csv(path, index=False)
+
+
+def write_hourly_files(first_hour, hours, decimals=2):
+    """One file per building per hour, 4 readings each (like the meter dumps)."""
+    os.makedirs(dashboard.DATA_DIR, exist_ok=True)
+    for h in range(first_hour, first_hour + hours):
+        start = pd.Timestamp("2024-01-01") + pd.Timedelta(hours=h)
+        for i, b in enumerate(BUILDINGS):
+            write_meter_file(f"{dashboard.DATA_DIR}/{b}-{h:06d}.csv", b, start, 4,
+                             seed=h * 10 + i, decimals=decimals)
+
+
+@contextlib.contextmanager
+def sandbox():
+    """Points dashboard at a throwaway data/output directory."""
+    old = dashboard.DATA_DIR, dashboard.OUTPUT_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard.DATA_DIR, dashboard.OUTPUT_DIR = f"{tmp}/data", f"{tmp}/output"
+        os.makedirs(dashboard.OUTPUT_DIR)
+        try:
+            yield tmp
+        finally:
+            dashboard.DATA_DIR, dashboard.OUTPUT_DIR = old
+
+
+def timed(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        return time.perf_counter() - start, result
+
+
+# ------------------------------------------------------------
+# BENCHMARKS
+# ------------------------------------------------------------
+def bench_incremental(history_hours=(30, 102, 390), new_hours=1):
+    """Re-run time should follow the number of new files, not the history.
+
+    The history has whole-kWh readings and the new files fractional ones
+    on a day already in the history, and the re-run totals are checked
+    against aggregating every file from scratch.
+    """
+    print("\n=== Incremental re-run ===")
+    print(f"{'history files':>14} {'full run (s)':>13} {'re-run (s)':>11} {'new files':>10}")
+    for hours in history_hours:
+        with sandbox():
+            write_hourly_files(0, hours, decimals=0)
+            cleaned = f"{dashboard.OUTPUT_DIR}/cleaned_data.csv"
+            full, _ = timed(dashboard.incremental_aggregates, cleaned_path=cleaned)
+            write_hourly_files(hours, new_hours)
+            rerun, agg = timed(dashboard.incremental_aggregates, cleaned_path=cleaned)
+            _, expected = timed(dashboard.stream_aggregates)
+            pd.testing.assert_frame_equal(agg.days, expected.days)
+            print(f"{hours * len(BUILDINGS):>14} {full:>13.3f} {rerun:>11.3f} "
+                  f"{new_hours * len(BUILDINGS):>10}")
+
+
+def bench_cache(buildings=20, periods=35_040):
+    """Plain CSV parse vs. cold and warm binary cache (a year of 15-min data)."""
+    print(f"\n=== Binary cache ({dashboard.columnar_format()}) ===")
+    with sandbox():
+        os.makedirs(dashboard.DATA_DIR)
+        for i in range(buildings):
+            write_meter_file(f"{dashboard.DATA_DIR}/b{i:03d}.csv", f"B{i:03d}",
+                             "2024-01-01", periods, seed=i)
+        plain, df = timed(dashboard.read_all_csv)
+        cold, _ = timed(dashboard.read_all_csv, cache=True)
+        warm, cached = timed(dashboard.read_all_csv, cache=True)
+        print(f"{len(df):,} readings in {buildings} files")
+        print(f"  csv parse   : {plain:.3f} s  ({df.memory_usage(deep=True).sum() / 2**20:.1f} MiB)")
+        print(f"  cache (cold): {cold:.3f} s")
+        print(f"  cache (warm): {warm:.3f} s  ({cached.memory_usage(deep=True).sum() / 2**20:.1f} MiB)")
+
+
+def bench_rollup(buildings=20, periods=35_040, queries=200):
+    """RollupIndex range/bucket queries vs. scanning the concatenated frame."""
+    print("\n=== Rollup index ===")
+    frames = []
+    for i in range(buildings):
+        ts = pd.date_range("2024-01-01", periods=periods, freq="15min")
+        frames.append(pd.DataFrame({"timestamp": ts, "building": f"B{i:03d}",
+                                    "kwh": np.random.default_rng(i).uniform(5, 50, periods)}))
+    df = pd.concat(frames, ignore_index=True)
+    manager = dashboard.BuildingManager()
+    manager.add_records(df)
+    build, index = timed(dashboard.RollupIndex.from_manager, manager)
+
+    rng = np.random.default_rng(0)
+    span = (df["timestamp"].max() - df["timestamp"].min()).value
+    picks = [(f"B{rng.integers(buildings):03d}",
+              *sorted(df["timestamp"].min() + pd.to_timedelta(rng.integers(0, span, 2), unit="ns")))
+             for _ in range(queries)]
+
+    def scan():
+        return [df.loc[(df["building"] == b) & (df["timestamp"] >= t1) & (df["timestamp"] < t2), "kwh"].sum()
+                for b, t1, t2 in picks]
+
+    def lookup():
+        return [index.kwh_between(b, t1, t2) for b, t1, t2 in picks]
+
+    scan_time, expected = timed(scan)
+    index_time, got = timed(lookup)
+    assert np.allclose(expected, got)
+
+    month_scan, _ = timed(lambda: df[df["building"] == "B000"].groupby(
+        df["timestamp"].dt.to_period("M"))["kwh"].sum())
+    month_index, _ = timed(index.bucket_totals, "B000", "month")
+
+    extra = pd.date_range(df["timestamp"].max() + pd.Timedelta("15min"), periods=96, freq="15min")
+    append, _ = timed(index.append, "B000", extra, np.ones(len(extra)))
+
+    print(f"{len(df):,} readings, {buildings} buildings, index built in {build:.3f} s")
+    print(f"  {queries} range queries: scan {scan_time:.3f} s, index {index_time:.4f} s")
+    print(f"  monthly buckets     : scan {month_scan:.4f} s, index {month_index:.4f} s")
+    print(f"  append one day      : {append * 1000:.2f} ms")
+
+
+def bench_render(buildings=20, periods=35_040):
+    """create_dashboard() vs. create_dashboard_fast() on a year of 15-min data."""
+    print("\n=== Dashboard rendering ===")
+    frames = []
+    for i in range(buildings):
+        ts = pd.date_range("2024-01-01", periods=periods, freq="15min")
+        frames.append(pd.DataFrame({"timestamp": ts, "building": f"B{i:03d}",
+                                    "kwh": np.random.default_rng(i).uniform(5, 50, periods)}))
+    df = pd.concat(frames, ignore_index=True)
+    with sandbox():
+        path = f"{dashboard.OUTPUT_DIR}/dashboard.png"
+        print(f"{len(df):,} readings, {buildings} buildings")
+        for name, fn in [("create_dashboard", dashboard.create_dashboard),
+                         ("create_dashboard_fast", dashboard.create_dashboard_fast)]:
+            seconds, _ = timed(fn, df)
+            print(f"  {name:<22}: {seconds:7.3f} s, {os.path.getsize(path) / 1024:8.1f} KiB")
+
+
+def bench_memory(buildings=20, periods=35_040):
+    """Per-stage memory footprint with the default vs. the compact schema."""
+    print("\n=== Memory footprint per stage (MiB) ===")
+    with sandbox():
+        os.makedirs(dashboard.DATA_DIR)
+        for i in range(buildings):
+            write_meter_file(f"{dashboard.DATA_DIR}/b{i:03d}.csv", f"B{i:03d}",
+                             "2024-01-01", periods, seed=i)
+        rows = {}
+        for compact in (False, True):
+            dashboard.COMPACT = compact
+            try:
+                _, df = timed(dashboard.read_all_csv)
+            finally:
+                dashboard.COMPACT = False
+            manager = dashboard.BuildingManager()
+            manager.add_records(df)
+            agg = dashboard.aggregate(df)
+            rows[compact] = [("readings", df), ("manager", manager), ("aggregates", agg)]
+        print(f"{len(df):,} readings")
+        print(f"  {'stage':<12} {'default':>9} {'compact':>9}")
+        for (stage, a), (_, b) in zip(rows[False], rows[True]):
+            print(f"  {stage:<12} {dashboard.memory_footprint(a) / 2**20:9.2f} "
+                  f"{dashboard.memory_footprint(b) / 2**20:9.2f}")
+
+
+BENCHMARKS = {
+    "incremental": bench_incremental,
+    "cache": bench_cache,
+    "rollup": bench_rollup,
+    "render": bench_render,
+    "memory": bench_memory,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Energy dashboard benchmarks")
+    parser.add_argument("names", nargs="*",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Timing checks for the inventory.
+
+Usage: python benchmark.py [name ...]     (no name -> run all)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bulk import export_file, import_file  # noqa: E402
+from inventory import LibraryInventory  # noqa: E402
+from migrate import migrate  # noqa: E402
+from sqlite_inventory import SqliteInventory  # noqa: E402
+
+WORDS = ("art war history python programming data science guide modern world "
+         "introduction theory practice secret garden ocean night city river "
+         "mountain light shadow empire machine learning music poetry journey").split()
+
+
+def synthetic_vocabulary(size: int, seed: int = 0) -> list:
+    """`size` made-up words, a stand-in for the long tail of real titles."""
+    rng = random.Random(seed)
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(size)]
+
+
+def synthetic_books(count: int, seed: int = 0, vocabulary: list = ()) -> list:
+    """Titles draw from WORDS, and with `vocabulary` 70% of words from it."""
+    rng = random.Random(seed)
+
+    def word() -> str:
+        return rng.choice(vocabulary) if vocabulary and rng.random() < 0.7 else rng.choice(WORDS)
+
+    return [
+        {
+            "title": " ".join(word() for _ in range(rng.randint(2, 6))).title(),
+            "author": f"Author {rng.randrange(count // 10 + 1)}",
+            "isbn": f"{978_000_000_000 + i}",
+            "status": rng.choice(["available", "issued"]),
+        }
+        for i in range(count)
+    ]
+
+
+def load_inventory(tmp: Path, books: list) -> LibraryInventory:
+    path = tmp / "books.json"
+    path.write_text(json.dumps(books), encoding="utf-8")
+    return LibraryInventory(path)
+
+
+def timed(fn, *args, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def bench_search(sizes=(1_000, 10_000, 100_000), queries=("garden", "machine learning", "ory pr", "war", "a")):
+    """Title search: the old full scan vs. the trigram index, plus ranked search.
+
+    Titles use a vocabulary of size / 2 words, roughly what real catalogs
+    show, so index build time reflects a realistic number of distinct words.
+    The trigram index is built by the first substring search, timed apart.
+    """
+    print("\n=== Title search (ms per query) ===")
+    print(f"{'books':>8} {'query':>18} {'scan':>8} {'index':>8} {'ranked':>8} {'hits':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            books = synthetic_books(size, vocabulary=synthetic_vocabulary(size // 2))
+            build_s, inventory = timed(load_inventory, Path(tmp), books)
+            inventory.close()
+            vocabulary = len(inventory._titles._words)
+            grams_s, _ = timed(inventory.search_by_title, queries[0])
+            print(f"{size:>8,} books, {vocabulary:,} distinct words: loaded and indexed in {build_s:.2f} s, "
+                  f"trigram index built in {grams_s:.2f} s")
+            for query in queries:
+                def scan():
+                    q = query.lower()
+                    return [b for b in inventory.books if q in b.title.lower()]
+
+                scan_s, expected = timed(scan, repeat=5)
+                index_s, found = timed(inventory.search_by_title, query, repeat=5)
+                ranked_s, _ = timed(inventory.search, query, repeat=5)
+                assert found == expected
+                print(f"{size:>8,} {query:>18} {scan_s * 1000:>8.2f} {index_s * 1000:>8.2f} "
+                      f"{ranked_s * 1000:>8.2f} {len(found):>7,}")
+
+
+def bench_journal(sizes=(1_000, 10_000, 100_000), operations=200):
+    """Cost of one issue/return: journal append vs. rewriting the whole JSON file."""
+    print("\n=== Persisting a checkout (ms per operation) ===")
+    print(f"{'books':>8} {'rewrite':>9} {'journal':>9} {'journal+sync':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            inventory = load_inventory(Path(tmp), synthetic_books(size))
+            book = inventory.books[size // 2]
+
+            def rewrite():
+                contents = json.dumps([b.to_dict() for b in inventory.books], indent=2)
+                (Path(tmp) / "rewrite.json").write_text(contents, encoding="utf-8")
+
+            def toggle():
+                return book.issue() or book.return_book()
+
+            def toggle_and_sync():
+                toggle()
+                inventory.save_to_file()
+
+            rewrite_s, _ = timed(rewrite, repeat=max(1, operations // (size // 1_000)))
+            journal_s, _ = timed(toggle, repeat=operations)
+            sync_s, _ = timed(toggle_and_sync, repeat=operations)
+            inventory.close()
+            print(f"{size:>8,} {rewrite_s * 1000:>9.2f} {journal_s * 1000:>9.3f} {sync_s * 1000:>13.3f}")
+
+
+def bench_backends(sizes=(10_000, 100_000, 500_000)):
+    """Startup and lookup time: JSON backend (loads everything) vs. SQLite (on demand)."""
+    print("\n=== Storage backends (ms) ===")
+    print(f"{'books':>8} {'json open':>10} {'sqlite open':>12} {'json isbn':>10} {'sqlite isbn':>12} "
+          f"{'json title':>11} {'sqlite title':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            books = synthetic_books(size)
+            json_path, db_path = Path(tmp) / f"{size}.json", Path(tmp) / f"{size}.db"
+            json_path.write_text(json.dumps(books), encoding="utf-8")
+            migrate(json_path, db_path)
+            isbn = books[size // 2]["isbn"]
+
+            json_open, json_inventory = timed(LibraryInventory, json_path)
+            sqlite_open, sqlite_inventory = timed(SqliteInventory, db_path)
+            json_isbn, _ = timed(json_inventory.search_by_isbn, isbn, repeat=100)
+            sqlite_isbn, _ = timed(sqlite_inventory.search_by_isbn, isbn, repeat=100)
+            json_title, _ = timed(json_inventory.search_by_title, "machine learning", repeat=5)
+            sqlite_title, _ = timed(sqlite_inventory.search_by_title, "machine learning", repeat=5)
+            json_inventory.close()
+            sqlite_inventory.close()
+            print(f"{size:>8,} {json_open * 1000:>10.1f} {sqlite_open * 1000:>12.1f} {json_isbn * 1000:>10.4f} "
+                  f"{sqlite_isbn * 1000:>12.4f} {json_title * 1000:>11.2f} {sqlite_title * 1000:>13.2f}")
+
+
+def bench_bulk(sizes=(10_000, 100_000), batch_size=10_000):
+    """Importing a JSON-lines catalog and exporting it again, per backend."""
+    print("\n=== Bulk import/export (records/s) ===")
+    print(f"{'books':>8} {'backend':>8} {'import':>10} {'export':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            source = Path(tmp) / f"{size}.jsonl"
+            with open(source, "w", encoding="utf-8") as f:
+                for book in synthetic_books(size):
+                    f.write(json.dumps(book) + "\n")
+            for backend, inventory in (("json", LibraryInventory(Path(tmp) / f"{size}.json")),
+                                       ("sqlite", SqliteInventory(Path(tmp) / f"{size}.db"))):
+                result = import_file(inventory, source, batch_size)
+                assert result.added == size
+                export_s, count = timed(export_file, inventory.iter_books(), Path(tmp) / f"{size}-{backend}.csv")
+                inventory.close()
+                print(f"{size:>8,} {backend:>8} {result.records_per_second:>10,.0f} {count / export_s:>10,.0f}")
+
+
+BENCHMARKS = {
+    "search": bench_search,
+    "journal": bench_journal,
+    "backends": bench_backends,
+    "bulk": bench_bulk,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Library inventory benchmarks")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
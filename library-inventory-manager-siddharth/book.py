@@ -1,4 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+STATUSES = ("available", "issued")
 
 
 @dataclass
@@ -7,6 +10,10 @@ class Book:
     author: str
     isbn: str
     status: str = "available"   # "available" or "issued"
+    # called with (book, old_status) after issue()/return_book() change the status
+    on_status_change: Optional[Callable[["Book", str], None]] = field(
+        default=None, repr=False, compare=False
+    )
 
     def __str__(self) -> str:
         return f"{self.title} by {self.author} (ISBN: {self.isbn}) - {self.status}"
@@ -19,15 +26,30 @@ class Book:
             "status": self.status,
         }
 
+    def validation_error(self) -> Optional[str]:
+        """Why this book cannot be stored, or None if it is valid."""
+        for name in ("title", "author", "isbn"):
+            value = getattr(self, name)
+            if not isinstance(value, str) or not value.strip():
+                return f"missing {name}"
+        if self.status not in STATUSES:
+            return f"unknown status {self.status!r}"
+        return None
+
+    def _set_status(self, status: str) -> None:
+        old_status, self.status = self.status, status
+        if self.on_status_change is not None:
+            self.on_status_change(self, old_status)
+
     def issue(self) -> bool:
         if self.status == "available":
-            self.status = "issued"
+            self._set_status("issued")
             return True
         return False
 
     def return_book(self) -> bool:
         if self.status == "issued":
-            self.status = "available"
+            self._set_status("available")
             return True
         return False
 
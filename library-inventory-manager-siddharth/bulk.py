@@ -0,0 +1,149 @@
+"""Bulk import and export of catalogs as JSON lines or CSV, streamed.
+
+Usage: python bulk.py import FILE [--batch-size N] [--backend ...] [--storage PATH]
+       python bulk.py export FILE [--backend ...] [--storage PATH]
+
+The format follows the file suffix: .csv, or JSON lines (.jsonl / .ndjson /
+.json with one object per line). Records are read and written one at a
+time, so neither side holds the catalog in memory as dicts.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+from book import Book
+
+FIELDS = ["title", "author", "isbn", "status"]
+MAX_ERRORS = 100  # rejected records kept for the report
+
+
+@dataclass
+class ImportResult:
+    added: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: List[Tuple[str, str]] = field(default_factory=list)  # (record, reason)
+    seconds: float = 0.0
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def reject(self, record, reason: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((str(record), reason))
+
+    def finish(self) -> "ImportResult":
+        self.seconds = time.perf_counter() - self._start
+        return self
+
+    @property
+    def processed(self) -> int:
+        return self.added + self.duplicates + self.invalid
+
+    @property
+    def records_per_second(self) -> float:
+        return self.processed / self.seconds if self.seconds else 0.0
+
+
+def is_csv(path: Path) -> bool:
+    return path.suffix.lower() == ".csv"
+
+
+def iter_records(path: Path) -> Iterator[Tuple[int, object]]:
+    """(line number, record dict) per record; unparsable lines give (line, error text)."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if is_csv(path):
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, f"invalid JSON: {exc.msg}"
+
+
+def iter_books(path: Path, result: ImportResult) -> Iterator[Book]:
+    """Books parsed from a catalog file; unreadable records go to `result`."""
+    for line_number, record in iter_records(path):
+        if not isinstance(record, dict):
+            reason = record if isinstance(record, str) else "record is not an object"
+            result.reject(f"line {line_number}", reason)
+            continue
+        yield Book(
+            title=(record.get("title") or "").strip(),
+            author=(record.get("author") or "").strip(),
+            isbn=str(record.get("isbn") or "").strip(),
+            status=(record.get("status") or "available").strip(),
+        )
+
+
+def import_file(inventory, path: Path, batch_size: int = 10_000) -> ImportResult:
+    parse = ImportResult()
+    result = inventory.add_books(iter_books(path, parse), batch_size=batch_size)
+    result.invalid += parse.invalid
+    result.errors = (parse.errors + result.errors)[:MAX_ERRORS]
+    return result.finish()
+
+
+def export_file(books: Iterable[Book], path: Path) -> int:
+    """Writes books one at a time; returns how many were written."""
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if is_csv(path):
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for book in books:
+                writer.writerow([book.title, book.author, book.isbn, book.status])
+                count += 1
+        else:
+            for book in books:
+                f.write(json.dumps(book.to_dict()))
+                f.write("\n")
+                count += 1
+    return count
+
+
+def main() -> None:
+    from storage import BACKENDS, open_inventory
+
+    parser = argparse.ArgumentParser(description="Bulk import/export of the library catalog")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("file", type=Path, help=".csv or JSON lines (.jsonl/.ndjson/.json)")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="books written per batch (import)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS))
+    parser.add_argument("--storage", type=Path)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    inventory = open_inventory(args.storage, args.backend)
+    try:
+        if args.command == "import":
+            result = import_file(inventory, args.file, args.batch_size)
+            print(f"Imported {result.added} books from {args.file}: {result.duplicates} duplicate ISBNs, "
+                  f"{result.invalid} invalid records skipped")
+            for record, reason in result.errors[:10]:
+                print(f"  {reason}: {record}")
+            print(f"{result.processed} records in {result.seconds:.2f} s "
+                  f"({result.records_per_second:,.0f} records/s)")
+        else:
+            start = time.perf_counter()
+            count = export_file(inventory.iter_books(), args.file)
+            seconds = time.perf_counter() - start
+            print(f"Exported {count} books to {args.file} in {seconds:.2f} s "
+                  f"({count / seconds if seconds else 0:,.0f} records/s)")
+    finally:
+        inventory.close()
+
+
+if __name__ == "__main__":
+    main()
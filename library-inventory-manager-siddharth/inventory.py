@@ -2,74 +2,283 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set
 
-from .book import Book
+from book import Book
+from bulk import ImportResult
+from journal import Journal, read_records, write_snapshot
+from search_index import TitleIndex
 
 logger = logging.getLogger(__name__)
 
 
 class LibraryInventory:
-    def __init__(self, storage_path: Path) -> None:
+    """Catalog kept in memory and persisted as a snapshot plus a journal.
+
+    storage_path (books.json) holds a snapshot; every add, issue and return
+    is appended as one record to storage_path + ".journal" instead of
+    rewriting the snapshot. Once at least `compact_every` changes (and as
+    many as the snapshot holds books) have accumulated, a background thread
+    folds them into a new snapshot.
+    """
+
+    def __init__(self, storage_path: Path, sync_every: int = 32, compact_every: int = 1000) -> None:
         self.storage_path = storage_path
+        self.journal_path = storage_path.with_name(storage_path.name + ".journal")
+        self.sync_every = sync_every
+        self.compact_every = compact_every
         self.books: List[Book] = []
+        # hash indexes over self.books; dicts keyed by id(book) keep insertion order
+        self._by_isbn: Dict[str, Book] = {}
+        self._by_author: Dict[str, Dict[int, Book]] = {}
+        self._by_status: Dict[str, Dict[int, Book]] = {}
+        self._positions: Dict[int, int] = {}
+        self._titles = TitleIndex()  # positions match self.books
+        self._lock = threading.RLock()
+        self._journal: Optional[Journal] = None
+        self._seq = 0  # number of the last journal record applied
+        self._changes = 0  # books added or changed since the newest snapshot
+        self._snapshot_books = 0  # books in the newest snapshot
+        self._compactor: Optional[threading.Thread] = None
         self.load_from_file()
 
+    # ------------ indexes ------------
+
+    def _index_book(self, book: Book) -> None:
+        self._positions[id(book)] = len(self._positions)
+        self._by_isbn.setdefault(book.isbn, book)  # first copy wins, like the old scan
+        self._by_author.setdefault(book.author.lower(), {})[id(book)] = book
+        self._by_status.setdefault(book.status, {})[id(book)] = book
+        self._titles.add(book.title)
+        book.on_status_change = self._status_changed
+
+    def _status_changed(self, book: Book, old_status: str) -> None:
+        self._by_status.get(old_status, {}).pop(id(book), None)
+        self._by_status.setdefault(book.status, {})[id(book)] = book
+        op = "issue" if book.status == "issued" else "return"
+        self._log({"op": op, "pos": self._positions[id(book)], "isbn": book.isbn})
+
+    def _rebuild_indexes(self) -> None:
+        self._positions = {}
+        self._by_isbn = {}
+        self._by_author = {}
+        self._by_status = {}
+        self._titles = TitleIndex()
+        for book in self.books:
+            self._index_book(book)
+
     # ------------ core operations ------------
 
     def add_book(self, book: Book) -> None:
-        self.books.append(book)
+        with self._lock:
+            self.books.append(book)
+            self._index_book(book)
+            self._log({"op": "add", "book": book.to_dict()})
         logger.info("Book added: %s", book)
-        self.save_to_file()
+
+    def add_books(self, books: Iterable[Book], batch_size: int = 10_000) -> ImportResult:
+        """Adds many books, skipping invalid ones and ISBNs already present.
+
+        Books are journaled as one record per batch of `batch_size`, and the
+        journal is synced once per batch.
+        """
+        result = ImportResult()
+        batch: List[Book] = []
+        pending: Set[str] = set()
+        for book in books:
+            error = book.validation_error()
+            if error is not None:
+                result.reject(book, error)
+            elif book.isbn in self._by_isbn or book.isbn in pending:
+                result.duplicates += 1
+            else:
+                batch.append(book)
+                pending.add(book.isbn)
+                if len(batch) >= batch_size:
+                    self._add_batch(batch)
+                    result.added += len(batch)
+                    batch, pending = [], set()
+        if batch:
+            self._add_batch(batch)
+            result.added += len(batch)
+        return result.finish()
+
+    def _add_batch(self, batch: List[Book]) -> None:
+        with self._lock:
+            for book in batch:
+                self.books.append(book)
+                self._index_book(book)
+            self._log({"op": "add_batch", "books": [book.to_dict() for book in batch]}, changes=len(batch))
+        self.sync()
+        logger.info("Added a batch of %d books", len(batch))
+
+    def iter_books(self) -> Iterator[Book]:
+        """Every book in order, one at a time (for streaming exports)."""
+        for i in range(len(self.books)):
+            yield self.books[i]
 
     def search_by_title(self, title: str) -> List[Book]:
-        title_lower = title.lower()
-        return [b for b in self.books if title_lower in b.title.lower()]
+        return [self.books[i] for i in self._titles.substring(title)]
+
+    def search(self, query: str, limit: int = 10) -> List[Book]:
+        """Ranked multi-word title search (words also match as prefixes)."""
+        return [self.books[i] for i, _ in self._titles.ranked(query, limit)]
 
     def search_by_isbn(self, isbn: str) -> Optional[Book]:
-        for b in self.books:
-            if b.isbn == isbn:
-                return b
-        return None
+        return self._by_isbn.get(isbn)
+
+    def search_by_author(self, author: str) -> List[Book]:
+        """Books whose author matches exactly, ignoring case."""
+        return list(self._by_author.get(author.lower(), {}).values())
+
+    def books_with_status(self, status: str) -> List[Book]:
+        return list(self._by_status.get(status, {}).values())
+
+    def available_books(self) -> List[Book]:
+        return self.books_with_status("available")
+
+    def issued_books(self) -> List[Book]:
+        return self.books_with_status("issued")
 
     def display_all(self) -> List[Book]:
         return list(self.books)
 
     # ------------ JSON persistence ------------
 
+    @property
+    def _rotated_path(self) -> Path:
+        return self.journal_path.with_name(self.journal_path.name + ".old")
+
+    def _log(self, record: dict, changes: int = 1) -> None:
+        """Appends one mutation to the journal (O(1), independent of catalog size)."""
+        with self._lock:
+            self._seq += 1
+            record["seq"] = self._seq
+            try:
+                self._journal.append(record)
+            except OSError as exc:
+                logger.error("Failed to write journal record: %s", exc)
+                return
+            self._changes += changes
+            # compact once the journal holds about as many changes as the
+            # snapshot holds books, so compaction stays O(1) per change
+            if self._changes >= max(self.compact_every, self._snapshot_books):
+                self.compact(background=True)
+
+    def _apply(self, record: dict) -> None:
+        if record["op"] == "add":
+            self.books.append(_book_from_dict(record["book"]))
+        elif record["op"] == "add_batch":
+            self.books.extend(_book_from_dict(item) for item in record["books"])
+        else:
+            self.books[record["pos"]].status = "issued" if record["op"] == "issue" else "available"
+
+    def sync(self) -> None:
+        """Forces journal records written so far to disk."""
+        if self._journal is not None:
+            self._journal.sync()
+
+    def compact(self, background: bool = False) -> None:
+        """Writes a snapshot of the catalog and drops the journal it covers.
+
+        The journal is renamed aside under the lock, so new records keep
+        going to a fresh journal while the snapshot is written. Records carry
+        sequence numbers and the snapshot stores the last one it includes, so
+        a crash at any step replays each record at most once.
+        """
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            data = [book.to_dict() for book in self.books]
+            seq = self._seq
+            self._changes = 0
+            self._snapshot_books = len(data)
+            rotated = self._rotated_path
+            if not rotated.exists():  # an existing one is left over from a crash; keep it
+                self._journal.rotate(rotated)
+
+        def run() -> None:
+            try:
+                write_snapshot(self.storage_path, data, seq)
+                rotated.unlink(missing_ok=True)
+                logger.info("Compacted %d books into %s", len(data), self.storage_path)
+            except OSError as exc:
+                logger.error("Failed to compact inventory: %s", exc)
+
+        if background:
+            self._compactor = threading.Thread(target=run, name="inventory-compactor", daemon=True)
+            self._compactor.start()
+        else:
+            run()
+
     def save_to_file(self) -> None:
+        """Makes every change so far durable: flushes the journal to disk."""
         try:
-            data = [book.to_dict() for book in self.books]
-            contents = json.dumps(data, indent=2)
-            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-            self.storage_path.write_text(contents, encoding="utf-8")
-            logger.info("Saved %d books to %s", len(self.books), self.storage_path)
-        except (OSError, TypeError, ValueError) as exc:
+            self.sync()
+        except OSError as exc:
             logger.error("Failed to save inventory: %s", exc)
 
-    def load_from_file(self) -> None:
+    def close(self) -> None:
+        if self._compactor is not None:
+            self._compactor.join()
+        if self._journal is not None:
+            self._journal.close()
+
+    def _read_snapshot(self) -> int:
+        """Loads storage_path into self.books; returns the journal seq it covers."""
+        self.books = []
         if not self.storage_path.exists():
             logger.info("Storage file %s does not exist, starting empty", self.storage_path)
-            self.books = []
-            return
+            return 0
         try:
             contents = self.storage_path.read_text(encoding="utf-8")
             if not contents.strip():
                 logger.info("Storage file %s is empty", self.storage_path)
-                self.books = []
-                return
+                return 0
             data = json.loads(contents)
-            self.books = [
-                Book(
-                    title=item.get("title", ""),
-                    author=item.get("author", ""),
-                    isbn=item.get("isbn", ""),
-                    status=item.get("status", "available"),
-                )
-                for item in data
-            ]
+            seq = 0
+            if isinstance(data, dict):  # snapshot; a plain list is the pre-journal format
+                seq, data = data.get("seq", 0), data.get("books", [])
+            self.books = [_book_from_dict(item) for item in data]
             logger.info("Loaded %d books from %s", len(self.books), self.storage_path)
+            return seq
         except (OSError, json.JSONDecodeError, TypeError, ValueError) as exc:
             logger.error("Failed to load inventory (corrupted/missing): %s", exc)
             self.books = []
+            return 0
+
+    def load_from_file(self) -> None:
+        """Snapshot, then the journal records newer than it, in order."""
+        with self._lock:
+            self.close()
+            self._seq = self._read_snapshot()
+            self._snapshot_books = len(self.books)
+            rotated, _ = read_records(self._rotated_path)
+            self._journal = Journal(self.journal_path, sync_every=self.sync_every)
+            replayed = changes = 0
+            for record in rotated + self._journal.records:
+                if record.get("seq", 0) > self._seq:
+                    try:
+                        self._apply(record)
+                    except (KeyError, IndexError, TypeError) as exc:
+                        logger.error("Skipping bad journal record %s: %s", record, exc)
+                    self._seq = record["seq"]
+                    replayed += 1
+                    changes += len(record.get("books", ())) or 1
+            self._changes = changes
+            if replayed:
+                logger.info("Replayed %d journal records", replayed)
+            self._rebuild_indexes()
+        if self._rotated_path.exists():
+            self.compact()
+
+
+def _book_from_dict(item: dict) -> Book:
+    return Book(
+        title=item.get("title", ""),
+        author=item.get("author", ""),
+        isbn=item.get("isbn", ""),
+        status=item.get("status", "available"),
+    )
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def encode_record(record: dict) -> bytes:
+    """One journal line: CRC32 of the JSON payload, a space, the payload."""
+    payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+
+def read_records(path: Path) -> Tuple[List[dict], int]:
+    """Records of a journal file and the byte length of its valid prefix.
+
+    Reading stops at the first line that is incomplete or fails its CRC,
+    i.e. a write torn by a crash; everything before it is intact.
+    """
+    if not path.exists():
+        return [], 0
+    records: List[dict] = []
+    valid = 0
+    for line in path.read_bytes().splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        try:
+            crc, payload = line[:-1].split(b" ", 1)
+            if int(crc, 16) != zlib.crc32(payload):
+                break
+            records.append(json.loads(payload))
+        except ValueError:  # also json.JSONDecodeError
+            break
+        valid += len(line)
+    return records, valid
+
+
+def fsync_directory(directory: Path) -> None:
+    """Makes a rename in `directory` durable (a no-op where unsupported)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_snapshot(path: Path, books: List[dict], seq: int) -> None:
+    """Atomically replaces `path` with the catalog as of journal record `seq`.
+
+    The snapshot is written to a temporary file, fsynced and renamed over
+    the old one, so a crash leaves either the old or the new file, never a
+    torn one.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"seq": seq, "books": books}, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    fsync_directory(path.parent)
+
+
+class Journal:
+    """Append-only write-ahead log with batched fsync (group commit).
+
+    Records are written and flushed immediately, and fsynced once
+    `sync_every` records are pending or `sync_interval` seconds have passed
+    since the last fsync; sync() forces it. A torn tail left by a crash is
+    cut off when the journal is opened, so new records follow the last good
+    one.
+    """
+
+    def __init__(self, path: Path, sync_every: int = 32, sync_interval: float = 1.0) -> None:
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.records, valid = read_records(path)  # recovered at open, for replay
+        if path.exists() and path.stat().st_size > valid:
+            logger.warning("Discarding torn journal tail in %s", path)
+            with open(path, "r+b") as f:
+                f.truncate(valid)
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+        return self._file
+
+    def append(self, record: dict) -> None:
+        with self._lock:
+            f = self._open()
+            f.write(encode_record(record))
+            f.flush()
+            self._pending += 1
+            if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        if self._file is not None and self._pending:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync_locked()
+
+    def rotate(self, rotated: Path) -> None:
+        """Syncs and renames the journal to `rotated`; appends go to a fresh file."""
+        with self._lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self.path.exists():
+                os.replace(self.path, rotated)
+                fsync_directory(self.path.parent)
+
+    def close(self) -> None:
+        with self._lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
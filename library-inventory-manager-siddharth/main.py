@@ -1,8 +1,10 @@
+import argparse
 import logging
 from pathlib import Path
 
 from inventory import LibraryInventory
 from book import Book
+from storage import BACKENDS, open_inventory
 
 
 def configure_logging() -> None:
@@ -30,6 +32,7 @@ def add_book_cli(inventory: LibraryInventory) -> None:
     isbn = get_non_empty_input("Enter ISBN: ")
     book = Book(title=title, author=author, isbn=isbn)
     inventory.add_book(book)
+    inventory.save_to_file()
     print("Book added successfully.")
 
 
@@ -64,6 +67,7 @@ def return_book_cli(inventory: LibraryInventory) -> None:
 def search_cli(inventory: LibraryInventory) -> None:
     print("1. Search by Title")
     print("2. Search by ISBN")
+    print("3. Keyword Search (ranked)")
     choice = input("Enter choice: ").strip()
     if choice == "1":
         title = get_non_empty_input("Enter title keyword: ")
@@ -80,6 +84,14 @@ def search_cli(inventory: LibraryInventory) -> None:
             print("Book not found.")
         else:
             print(book)
+    elif choice == "3":
+        query = get_non_empty_input("Enter keywords: ")
+        results = inventory.search(query)
+        if not results:
+            print("No books found.")
+        else:
+            for b in results:
+                print(b)
     else:
         print("Invalid choice.")
 
@@ -93,12 +105,21 @@ def view_all_cli(inventory: LibraryInventory) -> None:
             print(b)
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Library inventory manager")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        help="storage backend (default: from the file suffix, else json)")
+    parser.add_argument("--storage", type=Path,
+                        help="inventory file (default: data/books.json or data/books.db)")
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     configure_logging()
-    storage_path = Path("data") / "books.json"
 
     try:
-        inventory = LibraryInventory(storage_path)
+        inventory = open_inventory(args.storage, args.backend)
     except Exception as exc:
         logging.error("Failed to initialize inventory: %s", exc)
         print("Critical error initializing inventory.")
@@ -117,6 +138,7 @@ def main() -> None:
             choice = input("Enter your choice (1-6): ").strip()
         except (EOFError, KeyboardInterrupt):
             print("\nExiting...")
+            inventory.close()
             break
 
         try:
@@ -132,6 +154,7 @@ def main() -> None:
                 search_cli(inventory)
             elif choice == "6":
                 print("Goodbye!")
+                inventory.close()
                 break
             else:
                 print("Invalid choice. Please enter a number between 1 and 6.")
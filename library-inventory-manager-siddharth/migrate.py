@@ -0,0 +1,46 @@
+"""One-shot migration of a JSON inventory (snapshot + journal) to SQLite.
+
+Usage: python migrate.py [data/books.json] [data/books.db]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+from inventory import LibraryInventory
+from sqlite_inventory import SqliteInventory
+
+
+def migrate(json_path: Path, db_path: Path) -> int:
+    """Copies every book, in order, into a new database; returns the count."""
+    if db_path.exists():
+        raise FileExistsError(f"{db_path} already exists; refusing to migrate into it")
+    source = LibraryInventory(json_path)
+    target = SqliteInventory(db_path)
+    try:
+        return target.insert_all(source.books)
+    finally:
+        source.close()
+        target.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate a JSON inventory to SQLite")
+    parser.add_argument("source", nargs="?", type=Path, default=Path("data") / "books.json")
+    parser.add_argument("target", nargs="?", type=Path, default=Path("data") / "books.db")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    start = time.perf_counter()
+    try:
+        count = migrate(args.source, args.target)
+    except FileExistsError as exc:
+        sys.exit(str(exc))
+    print(f"Migrated {count} books from {args.source} to {args.target} in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
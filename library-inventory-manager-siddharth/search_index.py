@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+TOKEN_RE = re.compile(r"\w+")
+GRAM = 3  # substring queries shorter than this fall back to a scan
+PREFIX = 3  # ranked query words shorter than this only match whole words
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def grams(text: str) -> Set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class TitleIndex:
+    """Inverted indexes over book titles, addressed by position in the
+    inventory's book list.
+
+    - trigram -> positions, for the case-insensitive substring search the
+      inventory has always offered: candidates are the positions sharing
+      every trigram of the query, then each is confirmed with `in`, so the
+      results are exactly those of a full scan. It is built on the first
+      substring query rather than on load, being the larger of the two.
+    - word -> (positions, occurrences) plus a sorted vocabulary, for ranked
+      multi-word search where each query word of PREFIX or more characters
+      also matches as a prefix. New words are appended and the vocabulary
+      is sorted on the next prefix lookup, so building the index over a
+      catalog stays linear.
+
+    Positions are only ever appended in increasing order, so postings are
+    kept as sorted `array("I")`s rather than sets or dicts of Python ints.
+    """
+
+    def __init__(self) -> None:
+        self._titles: List[str] = []
+        self._grams: Optional[Dict[str, array]] = None
+        self._words: Dict[str, Tuple[array, array]] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_sorted = True
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def add(self, title: str) -> int:
+        position = len(self._titles)
+        lowered = title.lower()
+        self._titles.append(lowered)
+        if self._grams is not None:
+            self._add_grams(position, lowered)
+        for word in tokenize(lowered):
+            postings = self._words.get(word)
+            if postings is None:
+                postings = self._words[word] = (array("I"), array("I"))
+                self._vocabulary.append(word)
+                self._vocabulary_sorted = False
+            positions, counts = postings
+            if positions and positions[-1] == position:
+                counts[-1] += 1
+            else:
+                positions.append(position)
+                counts.append(1)
+        return position
+
+    def _add_grams(self, position: int, lowered: str) -> None:
+        for gram in grams(lowered):
+            postings = self._grams.get(gram)
+            if postings is None:
+                postings = self._grams[gram] = array("I")
+            postings.append(position)
+
+    def _trigrams(self) -> Dict[str, array]:
+        if self._grams is None:
+            self._grams = {}
+            for position, lowered in enumerate(self._titles):
+                self._add_grams(position, lowered)
+        return self._grams
+
+    def substring(self, query: str) -> List[int]:
+        """Positions whose title contains `query` (ignoring case), in order."""
+        query = query.lower()
+        if len(query) < GRAM:
+            return [i for i, title in enumerate(self._titles) if query in title]
+        index = self._trigrams()
+        postings = sorted((index.get(g, ()) for g in grams(query)), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return sorted(i for i in candidates if query in self._titles[i])
+
+    def _prefixed(self, word: str) -> List[str]:
+        if not self._vocabulary_sorted:
+            self._vocabulary.sort()  # mostly sorted already: close to linear
+            self._vocabulary_sorted = True
+        start = bisect_left(self._vocabulary, word)
+        end = start
+        while end < len(self._vocabulary) and self._vocabulary[end].startswith(word):
+            end += 1
+        return self._vocabulary[start:end]
+
+    def ranked(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """(position, score) for titles matching any query word, best first.
+
+        A title scores idf x occurrences for each query word it contains,
+        half that when the word only matches as a prefix (e.g. "prog" ->
+        "programming"); words shorter than PREFIX match whole words only,
+        as "a" would otherwise expand to a large share of the vocabulary.
+        Titles matching more query words rank first.
+        """
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        total = len(self._titles)
+        for term in set(tokenize(query)):
+            best: Dict[int, float] = {}
+            words = self._prefixed(term) if len(term) >= PREFIX else [term] if term in self._words else []
+            for word in words:
+                positions, counts = self._words[word]
+                weight = math.log(1 + total / len(positions)) * (1.0 if word == term else 0.5)
+                for position, count in zip(positions, counts):
+                    best[position] = max(best.get(position, 0.0), weight * count)
+            for position, score in best.items():
+                scores[position] = scores.get(position, 0.0) + score
+                matched[position] = matched.get(position, 0) + 1
+        ranking = heapq.nsmallest(limit, scores, key=lambda p: (-matched[p], -scores[p], p))
+        return [(p, scores[p]) for p in ranking]
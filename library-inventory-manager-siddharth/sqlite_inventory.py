@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set
+
+from book import Book
+from bulk import ImportResult
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id     INTEGER PRIMARY KEY,      -- insertion order, like the JSON list
+    title  TEXT NOT NULL,
+    author TEXT NOT NULL,
+    isbn   TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'available'
+);
+CREATE INDEX IF NOT EXISTS books_isbn ON books (isbn);
+CREATE INDEX IF NOT EXISTS books_title ON books (title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS books_author ON books (author COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS books_status ON books (status);
+"""
+
+# Trigram full-text index over titles, kept in sync by triggers. Needs
+# SQLite >= 3.34; without it title searches scan the table instead.
+TITLE_INSERT_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS books_title_insert AFTER INSERT ON books BEGIN
+    INSERT INTO book_titles (rowid, title) VALUES (new.id, new.title);
+END;
+"""
+TITLE_INDEX = """
+CREATE VIRTUAL TABLE IF NOT EXISTS book_titles USING fts5(
+    title, content='books', content_rowid='id', tokenize='trigram'
+);
+""" + TITLE_INSERT_TRIGGER + """
+CREATE TRIGGER IF NOT EXISTS books_title_delete AFTER DELETE ON books BEGIN
+    INSERT INTO book_titles (book_titles, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS books_title_update AFTER UPDATE OF title ON books BEGIN
+    INSERT INTO book_titles (book_titles, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO book_titles (rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
+COLUMNS = "id, title, author, isbn, status"
+MAX_PARAMETERS = 500  # stay well under SQLite's limit on bound variables
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+class SqliteInventory:
+    """LibraryInventory stored in an SQLite database and queried on demand.
+
+    Opening the inventory only opens the database, so startup time does not
+    depend on catalog size; each search runs an indexed query and only the
+    matching rows become Book objects. Issuing or returning a Book it
+    returned updates its row in a transaction, conditional on the status
+    the book had, so two sessions cannot issue the same copy.
+    """
+
+    def __init__(self, storage_path: Path) -> None:
+        self.storage_path = storage_path
+        storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(storage_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            try:
+                self._conn.executescript(TITLE_INDEX)
+                self._fts = True
+            except sqlite3.OperationalError as exc:
+                logger.warning("Full-text title index unavailable (%s); searches will scan", exc)
+                self._fts = False
+        logger.info("Opened SQLite inventory %s", storage_path)
+
+    # ------------ rows <-> books ------------
+
+    def _book(self, row) -> Book:
+        rowid, title, author, isbn, status = row
+        book = Book(title=title, author=author, isbn=isbn, status=status)
+        book.on_status_change = lambda b, old_status: self._status_changed(rowid, b, old_status)
+        return book
+
+    def _books(self, sql: str, params: Iterable = ()) -> List[Book]:
+        return [self._book(row) for row in self._conn.execute(sql, tuple(params))]
+
+    def _status_changed(self, rowid: int, book: Book, old_status: str) -> None:
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE books SET status = ? WHERE id = ? AND status = ?",
+                (book.status, rowid, old_status),
+            )
+        if cursor.rowcount != 1:
+            book.status = old_status
+            raise RuntimeError(f"Book {book.isbn} was changed by another session; try again")
+
+    # ------------ core operations ------------
+
+    def add_book(self, book: Book) -> None:
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO books (title, author, isbn, status) VALUES (?, ?, ?, ?)",
+                (book.title, book.author, book.isbn, book.status),
+            )
+        rowid = cursor.lastrowid
+        book.on_status_change = lambda b, old_status: self._status_changed(rowid, b, old_status)
+        logger.info("Book added: %s", book)
+
+    def insert_all(self, books: Iterable[Book]) -> int:
+        """Inserts books in a single transaction; returns how many."""
+        with self._conn:
+            cursor = self._conn.executemany(
+                "INSERT INTO books (title, author, isbn, status) VALUES (?, ?, ?, ?)",
+                ((b.title, b.author, b.isbn, b.status) for b in books),
+            )
+        return cursor.rowcount
+
+    def add_books(self, books: Iterable[Book], batch_size: int = 10_000) -> ImportResult:
+        """Adds many books, skipping invalid ones and ISBNs already present.
+
+        Each batch of `batch_size` books is checked against the isbn index
+        and inserted in a single transaction, with the title index filled
+        once per batch rather than by the per-row trigger.
+        """
+        result = ImportResult()
+        batch: List[Book] = []
+        pending: Set[str] = set()
+        for book in books:
+            error = book.validation_error()
+            if error is not None:
+                result.reject(book, error)
+            elif book.isbn in pending:
+                result.duplicates += 1
+            else:
+                batch.append(book)
+                pending.add(book.isbn)
+                if len(batch) >= batch_size:
+                    self._add_batch(batch, result)
+                    batch = []
+        if batch:
+            self._add_batch(batch, result)
+        return result.finish()
+
+    def _existing_isbns(self, isbns: List[str]) -> Set[str]:
+        found: Set[str] = set()
+        for start in range(0, len(isbns), MAX_PARAMETERS):
+            chunk = isbns[start:start + MAX_PARAMETERS]
+            rows = self._conn.execute(
+                f"SELECT isbn FROM books WHERE isbn IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            found.update(isbn for (isbn,) in rows)
+        return found
+
+    def _add_batch(self, batch: List[Book], result: ImportResult) -> None:
+        with self._conn:
+            # take the write lock first: no other session can add an isbn
+            # between the check and the insert, or see the trigger missing
+            self._conn.execute("BEGIN IMMEDIATE")
+            existing = self._existing_isbns([book.isbn for book in batch])
+            fresh = [book for book in batch if book.isbn not in existing]
+            if self._fts:
+                self._conn.execute("DROP TRIGGER books_title_insert")
+            last_id = self._conn.execute("SELECT coalesce(max(id), 0) FROM books").fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO books (title, author, isbn, status) VALUES (?, ?, ?, ?)",
+                ((b.title, b.author, b.isbn, b.status) for b in fresh),
+            )
+            if self._fts:
+                self._conn.execute(
+                    "INSERT INTO book_titles (rowid, title) SELECT id, title FROM books WHERE id > ?",
+                    (last_id,),
+                )
+                self._conn.execute(TITLE_INSERT_TRIGGER)
+        result.added += len(fresh)
+        result.duplicates += len(batch) - len(fresh)
+        logger.info("Added a batch of %d books", len(fresh))
+
+    def iter_books(self) -> Iterator[Book]:
+        """Every book in order, read from the database as it is consumed."""
+        for row in self._conn.execute(f"SELECT {COLUMNS} FROM books ORDER BY id"):
+            yield self._book(row)
+
+    def search_by_title(self, title: str) -> List[Book]:
+        """Case-insensitive substring search, in insertion order."""
+        needle = title.lower()
+        if self._fts and len(needle) >= 3:
+            candidates = self._books(
+                f"SELECT {COLUMNS} FROM books WHERE id IN "
+                "(SELECT rowid FROM book_titles WHERE book_titles MATCH ?) ORDER BY id",
+                (_fts_phrase(title),),
+            )
+        else:
+            candidates = self._books(
+                f"SELECT {COLUMNS} FROM books WHERE instr(lower(title), ?) > 0 ORDER BY id", (needle,)
+            )
+        # SQLite only folds ASCII case; confirm with the same test the JSON backend uses
+        return [b for b in candidates if needle in b.title.lower()]
+
+    def search(self, query: str, limit: int = 10) -> List[Book]:
+        """Ranked multi-word title search (best bm25 score first)."""
+        words = [w for w in query.split() if len(w) >= 3]
+        if not self._fts or not words:
+            return self.search_by_title(query)[:limit]
+        return self._books(
+            f"SELECT {', '.join('b.' + c for c in COLUMNS.split(', '))} FROM book_titles "
+            "JOIN books b ON b.id = book_titles.rowid "
+            "WHERE book_titles MATCH ? ORDER BY bm25(book_titles), b.id LIMIT ?",
+            (" OR ".join(_fts_phrase(w) for w in words), limit),
+        )
+
+    def search_by_isbn(self, isbn: str) -> Optional[Book]:
+        books = self._books(f"SELECT {COLUMNS} FROM books WHERE isbn = ? ORDER BY id LIMIT 1", (isbn,))
+        return books[0] if books else None
+
+    def search_by_author(self, author: str) -> List[Book]:
+        return self._books(
+            f"SELECT {COLUMNS} FROM books WHERE author = ? COLLATE NOCASE ORDER BY id", (author,)
+        )
+
+    def books_with_status(self, status: str) -> List[Book]:
+        return self._books(f"SELECT {COLUMNS} FROM books WHERE status = ? ORDER BY id", (status,))
+
+    def available_books(self) -> List[Book]:
+        return self.books_with_status("available")
+
+    def issued_books(self) -> List[Book]:
+        return self.books_with_status("issued")
+
+    def display_all(self) -> List[Book]:
+        return self._books(f"SELECT {COLUMNS} FROM books ORDER BY id")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT count(*) FROM books").fetchone()[0]
+
+    # ------------ persistence ------------
+
+    def save_to_file(self) -> None:
+        """Every change is committed as it happens; nothing to do."""
+
+    def load_from_file(self) -> None:
+        """Queries always read the database; nothing to load."""
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Union
+
+from inventory import LibraryInventory
+from sqlite_inventory import SqliteInventory
+
+BACKENDS = {
+    "json": LibraryInventory,
+    "sqlite": SqliteInventory,
+}
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+DEFAULT_PATHS = {
+    "json": Path("data") / "books.json",
+    "sqlite": Path("data") / "books.db",
+}
+
+
+def backend_for(storage_path: Path) -> str:
+    return "sqlite" if storage_path.suffix.lower() in SQLITE_SUFFIXES else "json"
+
+
+def open_inventory(
+    storage_path: Optional[Path] = None, backend: Optional[str] = None
+) -> Union[LibraryInventory, SqliteInventory]:
+    """Opens an inventory with the named backend ("json" or "sqlite").
+
+    Without a backend it is chosen from the file suffix (.db / .sqlite ->
+    SQLite); without a path the backend's default file under data/ is used.
+    """
+    if backend is None:
+        backend = backend_for(storage_path) if storage_path is not None else "json"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend {backend!r} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[backend](storage_path or DEFAULT_PATHS[backend])
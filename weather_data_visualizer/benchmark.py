@@ -0,0 +1,202 @@
+# benchmark.py
+# Timing checks for the weather analysis modules.
+#
+# Usage: python benchmark.py [name ...]     (no name → run all)
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import weather_engine
+import weather_generator
+import weather_store
+import weather_stream
+import weather_visualizer
+from weather_schema import SEASON_BINS, SEASON_LABELS
+
+
+# Helpers
+
+def synthetic_stations(stations, start='2023-01-01', end='2023-12-31', seed=0):
+    """Long frame (station, date, temperature_c, humidity_percent, rainfall_mm)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, end, freq='D')
+    n = len(dates) * stations
+    phase = 2 * np.pi * np.tile(np.arange(len(dates)), stations) / 365
+    rain = rng.exponential(2, n)
+    return pd.DataFrame({
+        'station': np.repeat([f'S{i:05d}' for i in range(stations)], len(dates)),
+        'date': np.tile(dates, stations),
+        'temperature_c': np.clip(20 + 10 * np.sin(phase) + rng.normal(0, 3, n), 5, 40),
+        'humidity_percent': np.clip(60 + 15 * np.sin(phase + np.pi) + rng.normal(0, 10, n), 20, 95),
+        'rainfall_mm': np.clip(np.where(rng.random(n) > 0.7, rain, 0), 0, 50),
+    })
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+# Benchmarks
+
+def bench_engine(station_counts=(1, 10, 100, 1_000, 10_000), loop_limit=100):
+    """Station-days per second: analyze_all() vs. analyze() once per station."""
+    print("\n=== Multi-station engine (1 year per station) ===")
+    print(f"{'stations':>9} {'station-days':>13} {'engine/s':>14} {'per-station loop/s':>19}")
+    for count in station_counts:
+        df = synthetic_stations(count)
+        seconds, _ = timed(weather_engine.analyze_all, df)
+        loop = '-'
+        if count <= loop_limit:
+            def per_station():
+                for _, group in df.groupby('station'):
+                    weather_visualizer.analyze(group)
+            loop_seconds, _ = timed(per_station)
+            loop = f'{len(df) / loop_seconds:,.0f}'
+        print(f"{count:>9,} {len(df):>13,} {len(df) / seconds:>14,.0f} {loop:>19}")
+
+
+def bench_store(stations=20, years=50, missing=0.02):
+    """CSV parse + analyze() vs. analyze() on the memory-mapped store, checked
+    against the pandas statistics on data with missing values."""
+    print(f"\n=== Memory-mapped store ({stations} stations x {years} years, {missing:.0%} missing) ===")
+    first = 2024 - years + 1
+    df = synthetic_stations(stations, start=f'{first}-01-01', end='2024-12-31')
+    rng = np.random.default_rng(1)
+    for var in weather_stream.VARIABLES:
+        df.loc[rng.random(len(df)) < missing, var] = np.nan
+    df.loc[df['date'] < f'{first}-02-01', 'temperature_c'] = np.nan  # weeks with no readings at all
+    with tempfile.TemporaryDirectory() as tmp:
+        store = weather_store.WeatherStore(os.path.join(tmp, 'store'))
+        for station, group in df.groupby('station'):
+            group.drop(columns='station').to_csv(os.path.join(tmp, f'{station}.csv'), index=False)
+            store.append(station, group)
+        names = store.stations()
+
+        def from_csv():
+            for station in names:
+                weather_visualizer.analyze(weather_visualizer.clean(
+                    pd.read_csv(os.path.join(tmp, f'{station}.csv'))))
+
+        def from_store():
+            for station in names:
+                weather_store.analyze(store.records(station))
+
+        def one_month():
+            for station in names:
+                weather_store.daily_stats(store.records(station, '2000-07-01', '2000-07-31'))
+
+        csv_seconds, _ = timed(from_csv)
+        store_seconds, _ = timed(from_store)
+        range_seconds, _ = timed(one_month)
+        expected = weather_visualizer.analyze(weather_visualizer.clean(
+            pd.read_csv(os.path.join(tmp, f'{names[0]}.csv'))))
+        for key, got in weather_store.analyze(store.records(names[0])).items():
+            if key == 'daily_stats':
+                got, want = list(got.values()), list(expected[key].values())
+            else:
+                got, want = got.to_numpy(np.float64), expected[key].to_numpy(np.float64)
+            np.testing.assert_allclose(got, want, rtol=1e-5, err_msg=key)  # store keeps float32
+        empty = weather_store.daily_stats(store.records(names[0], '1900-01-01', '1900-12-31'))
+        assert all(np.isnan(value) for value in empty.values()), empty
+        csv_bytes = sum(os.path.getsize(os.path.join(tmp, f'{s}.csv')) for s in names)
+        store_bytes = sum(os.path.getsize(store.path(s)) for s in names)
+    print(f"{len(df):,} station-days; csv {csv_bytes / 2**20:.1f} MiB, store {store_bytes / 2**20:.1f} MiB")
+    print(f"  csv parse + analyze : {csv_seconds:.3f} s")
+    print(f"  store analyze       : {store_seconds:.3f} s")
+    print(f"  one-month range     : {range_seconds * 1000:.2f} ms for all stations")
+    print("  results match the pandas statistics")
+
+
+def bench_generator(stations=2_000, years=10, worker_counts=(1, 2, 4)):
+    """Station-days per second streamed by generate_blocks(), serial vs. pool."""
+    print(f"\n=== Synthetic generator ({stations:,} stations x {years} years) ===")
+    print(f"{'workers':>8} {'seconds':>9} {'station-days/s':>15} {'largest block':>14}")
+    for workers in worker_counts:
+        rows = largest = 0
+        start = time.perf_counter()
+        for block in weather_generator.generate_blocks(stations, years, workers=workers):
+            rows += len(block)
+            largest = max(largest, len(block))
+        seconds = time.perf_counter() - start
+        print(f"{workers:>8} {seconds:>9.2f} {rows / seconds:>15,.0f} {largest:>14,}")
+
+
+def bench_render(stations=8, workers=(1, 4), dpi=300):
+    """Seconds per station figure at the same dpi: plot() vs. render_cached()
+    serial, pooled and cached."""
+    print(f"\n=== Station figures ({stations} stations x 1 year, {dpi} dpi) ===")
+    frames = [(weather_generator.station_name(i), weather_generator.generate_station(i).drop(columns='station'))
+              for i in range(stations)]
+    with tempfile.TemporaryDirectory() as tmp:
+        def original():
+            for station, df in frames:
+                weather_visualizer.plot(df, os.path.join(tmp, f'{station}.png'), title=station, dpi=dpi)
+
+        seconds, _ = timed(original)
+        print(f"  plot() tight bbox    : {seconds / stations:.3f} s/station")
+        for count in workers:
+            out = os.path.join(tmp, f'run{count}')
+            seconds, _ = timed(weather_visualizer.run, frames, out, export_data=False, workers=count, dpi=dpi)
+            print(f"  run() {count} worker(s)    : {seconds / stations:.3f} s/station")
+        seconds, _ = timed(weather_visualizer.run, frames, out, export_data=False, workers=workers[-1], dpi=dpi)
+        print(f"  run() unchanged      : {seconds / stations:.3f} s/station (cached)")
+
+
+def bench_stream(years=20, missing=0.02):
+    """Days per second through a StationStream, checked against the pandas
+    (NaN-skipping) statistics it replaced on data with missing values."""
+    print(f"\n=== Streaming statistics (1 station x {years} years, {missing:.0%} missing) ===")
+    df = synthetic_stations(1, start=f'{2024 - years + 1}-01-01', end='2024-12-31').drop(columns='station')
+    rng = np.random.default_rng(1)
+    for var in weather_stream.VARIABLES:
+        df.loc[rng.random(len(df)) < missing, var] = np.nan
+
+    temps = df['temperature_c']
+    expected_daily = [np.mean(temps), np.min(temps), np.max(temps), np.std(temps)]
+    season = pd.cut(df['date'].dt.month, bins=SEASON_BINS, labels=SEASON_LABELS).rename('season')
+    expected_seasonal = df.groupby(season, observed=False)[
+        ['temperature_c', 'rainfall_mm', 'humidity_percent']].agg(['mean', 'std'])
+
+    stream = weather_stream.StationStream()
+    batch_seconds, daily = timed(weather_visualizer.daily_stats, df)
+    seconds, flagged = timed(lambda: sum(len(a) for _, a in stream.feed(df)))
+    for result in (daily, stream.daily_stats()):
+        np.testing.assert_allclose(list(result.values()), expected_daily, rtol=1e-9)
+    for result in (weather_visualizer.seasonal_stats(df), stream.seasonal_stats()):
+        np.testing.assert_allclose(result.to_numpy(), expected_seasonal.to_numpy(), rtol=1e-9)
+    for var in weather_stream.VARIABLES:
+        assert np.isfinite(stream[var].rolling.mean) and np.isfinite(stream[var].ewma.mean), var
+    print(f"  stream : {len(df) / seconds:,.0f} days/s, {flagged} anomalies flagged")
+    print(f"  batch  : {len(df) / batch_seconds:,.0f} days/s (daily_stats)")
+    print("  results match the pandas statistics")
+
+
+BENCHMARKS = {
+    'engine': bench_engine,
+    'store': bench_store,
+    'generator': bench_generator,
+    'render': bench_render,
+    'stream': bench_stream,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Weather analysis benchmarks')
+    parser.add_argument('names', nargs='*',
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# weather_engine.py
+# Vectorized Task 3 / Task 5 statistics for many stations at once.
+#
+# Instead of calling weather_visualizer.analyze() once per station, the
+# whole multi-station frame is grouped a single time by
+# (station, week, month) into count / sum / M2 / min / max moments, and
+# every table is rolled up from those moments.
+import numpy as np
+import pandas as pd
+
+from weather_schema import SEASON_BINS, SEASON_LABELS, VARIABLES
+
+
+def base_moments(df):
+    """The single grouped pass over the observations.
+
+    `df` needs station, date and the three weather columns. Returns one
+    row per (station, week, month) with columns (variable, moment); week
+    is the Sunday that ends the week, like resample('W').
+    """
+    date = df['date']
+    keys = [
+        df['station'],
+        (date.dt.normalize() + pd.to_timedelta(6 - date.dt.weekday, unit='D')).rename('week'),
+        date.dt.month.rename('month'),
+    ]
+    agg = df.groupby(keys, observed=True, sort=True)[VARIABLES].agg(['count', 'sum', 'var', 'min', 'max'])
+    agg = agg.rename(columns={'count': 'n'}, level=1)
+    for var in VARIABLES:
+        # M2 (sum of squared deviations) combines across groups, var does not
+        agg[(var, 'm2')] = (agg[(var, 'var')] * (agg[(var, 'n')] - 1)).fillna(0.0)
+    return agg.drop(columns='var', level=1)
+
+
+def rollup(base, keys):
+    """Combines moments up to coarser groups (Chan et al. parallel variance).
+
+    `keys` are index level names or arrays aligned with `base`. Returns
+    (variable, moment) columns: n, sum, mean, m2, min, max.
+    """
+    out = {}
+    for var in VARIABLES:
+        col = base[var]
+        groups = col.groupby(keys, observed=True, sort=True)
+        n = groups['n'].sum()
+        total = groups['sum'].sum()
+        # M2 = Σ M2_i + Σ n_i (mean_i - mean)^2, mean broadcast back to each row
+        group_mean = groups['sum'].transform('sum') / groups['n'].transform('sum')
+        spread = col['n'] * (col['sum'] / col['n'] - group_mean) ** 2
+        out.update({
+            (var, 'n'): n,
+            (var, 'sum'): total,
+            (var, 'mean'): total / n,
+            (var, 'm2'): groups['m2'].sum() + spread.groupby(keys, observed=True, sort=True).sum(),
+            (var, 'min'): groups['min'].min(),
+            (var, 'max'): groups['max'].max(),
+        })
+    return pd.DataFrame(out)
+
+
+def std(moments, var, ddof=1):
+    return np.sqrt(moments[(var, 'm2')] / (moments[(var, 'n')] - ddof))
+
+
+def analyze_all(df):
+    """Every statistic of weather_visualizer.analyze(), for all stations.
+
+    Each table gets 'station' as its outer index level; the inner levels
+    and columns match the single-station tables. Weeks with no
+    observations are omitted rather than reported as NaN rows.
+    """
+    base = base_moments(df)
+    month = base.index.get_level_values('month')
+    season = pd.CategoricalIndex(pd.cut(month, bins=SEASON_BINS, labels=SEASON_LABELS), name='season')
+
+    per_station = rollup(base, ['station'])
+    per_month = rollup(base, ['station', 'month'])
+    per_week = rollup(base, ['station', 'week'])
+    per_season = rollup(base, [base.index.get_level_values('station'), season])
+
+    t = 'temperature_c'
+    daily_stats = pd.DataFrame({
+        'mean_temp': per_station[(t, 'mean')],
+        'min_temp': per_station[(t, 'min')],
+        'max_temp': per_station[(t, 'max')],
+        'std_temp': std(per_station, t, ddof=0),
+    })
+
+    r = 'rainfall_mm'
+    monthly_rain = pd.DataFrame({
+        'mean': per_month[(r, 'mean')],
+        'sum': per_month[(r, 'sum')],
+        'min': per_month[(r, 'min')],
+        'max': per_month[(r, 'max')],
+        'std': std(per_month, r),
+    }).rename_axis(['station', 'date'])
+
+    seasonal_stats = pd.DataFrame({
+        (var, stat): per_season[(var, 'mean')] if stat == 'mean' else std(per_season, var)
+        for var in ['temperature_c', 'rainfall_mm', 'humidity_percent'] for stat in ['mean', 'std']
+    })
+
+    monthly_stats = pd.DataFrame({
+        (var, stat): per_month[(var, stat)]
+        for var in ['temperature_c', 'rainfall_mm'] for stat in ['mean', 'sum']
+    })
+
+    weekly_temp = pd.DataFrame({
+        'mean': per_week[(t, 'mean')],
+        'max': per_week[(t, 'max')],
+        'min': per_week[(t, 'min')],
+    }).rename_axis(['station', 'date'])
+
+    return {
+        'daily_stats': daily_stats,
+        'monthly_rain': monthly_rain,
+        'seasonal_stats': seasonal_stats,
+        'monthly_stats': monthly_stats,
+        'weekly_temp': weekly_temp,
+    }
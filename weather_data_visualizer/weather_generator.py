@@ -0,0 +1,140 @@
+# weather_generator.py
+# Synthetic daily weather for N stations x M years, for load testing.
+#
+# Same seasonal model as Task 1 in weather_visualizer.generate(), but every
+# station has its own seed and its own random streams, so a station's data
+# is identical whether it is generated alone, serially with others or in a
+# worker process. Output is streamed as blocks of whole stations, so memory
+# is bounded by the block size, not the total number of station-days.
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class SeasonalModel:
+    """Sine-shaped seasonal cycle plus noise (defaults match Task 1)."""
+    temp_mean: float = 20.0
+    temp_amplitude: float = 10.0
+    temp_noise: float = 3.0
+    temp_range: tuple = (5.0, 40.0)
+    humidity_mean: float = 60.0
+    humidity_amplitude: float = 15.0
+    humidity_noise: float = 10.0
+    humidity_range: tuple = (20.0, 95.0)
+    rain_scale: float = 2.0
+    rain_probability: float = 0.3
+    rain_max: float = 50.0
+    period_days: float = 365.0
+    phase: float = 0.0      # radians; shift the cycle for e.g. the other hemisphere
+
+
+def station_name(index):
+    return f'S{index:06d}'
+
+
+def station_streams(seed, index):
+    """Four independent generators (temperature, humidity, rain amount, rain
+    flag) that depend only on (seed, station index)."""
+    children = np.random.SeedSequence([seed, index]).spawn(4)
+    return [np.random.default_rng(child) for child in children]
+
+
+def generate_station(index, start_year=2023, years=1, model=SeasonalModel(), seed=0):
+    """One station's daily observations as a DataFrame."""
+    dates = pd.date_range(f'{start_year}-01-01', f'{start_year + years - 1}-12-31', freq='D')
+    n = len(dates)
+    temp_rng, humidity_rng, rain_rng, wet_rng = station_streams(seed, index)
+    cycle = 2 * np.pi * np.arange(n) / model.period_days + model.phase
+
+    temperature = model.temp_mean + model.temp_amplitude * np.sin(cycle) + temp_rng.normal(0, model.temp_noise, n)
+    humidity = (model.humidity_mean + model.humidity_amplitude * np.sin(cycle + np.pi)
+                + humidity_rng.normal(0, model.humidity_noise, n))
+    rainfall = rain_rng.exponential(model.rain_scale, n)
+    rainfall = np.where(wet_rng.random(n) < model.rain_probability, rainfall, 0)
+
+    return pd.DataFrame({
+        'station': station_name(index),
+        'date': dates,
+        'temperature_c': np.clip(temperature, *model.temp_range),
+        'humidity_percent': np.clip(humidity, *model.humidity_range),
+        'rainfall_mm': np.clip(rainfall, 0, model.rain_max),
+    })
+
+
+def _generate_batch(indices, start_year, years, model, seed):
+    models = model if callable(model) else None
+    frames = [generate_station(i, start_year, years, models(i) if models else model, seed) for i in indices]
+    return pd.concat(frames, ignore_index=True)
+
+
+def generate_blocks(stations, years=1, start_year=2023, model=SeasonalModel(), seed=0,
+                    stations_per_block=64, workers=None):
+    """Yields DataFrame blocks of `stations_per_block` whole stations, in order.
+
+    `model` is a SeasonalModel or a function station index -> SeasonalModel.
+    With `workers` > 1 blocks are generated in a process pool; at most
+    2 x workers blocks are in flight, so memory stays bounded even when
+    the consumer is slower than the generators. The blocks are identical
+    to the serial ones.
+    """
+    batches = [range(lo, min(lo + stations_per_block, stations))
+               for lo in range(0, stations, stations_per_block)]
+    if not workers or workers <= 1:
+        for batch in batches:
+            yield _generate_batch(batch, start_year, years, model, seed)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for batch in batches:
+            pending.append(pool.submit(_generate_batch, batch, start_year, years, model, seed))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def write_csv(path, blocks):
+    """Streams blocks into one CSV file; returns the number of rows written."""
+    rows = 0
+    with open(path, 'w', newline='') as f:
+        for block in blocks:
+            block.to_csv(f, index=False, header=rows == 0)
+            rows += len(block)
+    return rows
+
+
+def write_store(store, blocks):
+    """Streams blocks into a weather_store.WeatherStore; returns rows written."""
+    rows = 0
+    for block in blocks:
+        for station, group in block.groupby('station', sort=False):
+            store.append(station, group)
+        rows += len(block)
+    return rows
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate synthetic station weather data')
+    parser.add_argument('output', help='CSV file, or a directory for a WeatherStore with --store')
+    parser.add_argument('--stations', type=int, default=10)
+    parser.add_argument('--years', type=int, default=1)
+    parser.add_argument('--start-year', type=int, default=2023)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--store', action='store_true', help='write a memory-mapped WeatherStore')
+    args = parser.parse_args()
+
+    blocks = generate_blocks(args.stations, args.years, args.start_year, seed=args.seed, workers=args.workers)
+    if args.store:
+        from weather_store import WeatherStore
+        rows = write_store(WeatherStore(args.output), blocks)
+    else:
+        rows = write_csv(args.output, blocks)
+    print(f"{rows:,} station-days written to {args.output}")
@@ -0,0 +1,10 @@
+# weather_schema.py
+# Column names and season definitions shared by the weather modules.
+#
+# Kept apart from weather_visualizer so the analysis modules can import
+# them without importing each other.
+
+COLUMNS = ['date', 'temperature_c', 'humidity_percent', 'rainfall_mm']
+VARIABLES = COLUMNS[1:]
+SEASON_BINS = [0, 3, 6, 9, 12]
+SEASON_LABELS = ['Winter', 'Pre-Monsoon', 'Monsoon', 'Post-Monsoon']
@@ -0,0 +1,209 @@
+# weather_store.py
+# On-disk store of daily observations as fixed-width binary records.
+#
+# Each station is one file of RECORD structs (16 bytes per day) sorted by
+# date, opened with np.memmap. Date-range lookups are a binary search on
+# the date column, and the Task 3 / Task 5 statistics below read the
+# mapped columns directly, block by block, instead of parsing a CSV.
+import os
+
+import numpy as np
+import pandas as pd
+
+from weather_schema import COLUMNS, SEASON_LABELS
+
+RECORD = np.dtype([
+    ('date', '<i4'),               # days since 1970-01-01
+    ('temperature_c', '<f4'),
+    ('humidity_percent', '<f4'),
+    ('rainfall_mm', '<f4'),
+])
+SUFFIX = '.wx'
+BLOCK = 1 << 20  # records per block when computing statistics
+
+
+def to_days(dates):
+    return np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+
+
+def to_dates(days):
+    return np.asarray(days, dtype=np.int64).astype('datetime64[D]')
+
+
+class WeatherStore:
+    """A directory with one memory-mapped record file per station."""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, station):
+        return os.path.join(self.root, f'{station}{SUFFIX}')
+
+    def stations(self):
+        return sorted(name[:-len(SUFFIX)] for name in os.listdir(self.root) if name.endswith(SUFFIX))
+
+    def __len__(self):
+        return len(self.stations())
+
+    def count(self, station):
+        path = self.path(station)
+        return os.path.getsize(path) // RECORD.itemsize if os.path.exists(path) else 0
+
+    def append(self, station, df):
+        """Appends observations (COLUMNS) that are later than the stored ones.
+
+        Dates must be strictly increasing, both within `df` and relative to
+        the last stored day, so the file stays sorted for range lookups.
+        """
+        records = np.empty(len(df), dtype=RECORD)
+        records['date'] = to_days(pd.to_datetime(df['date']).to_numpy())
+        for col in COLUMNS[1:]:
+            records[col] = df[col].to_numpy()
+        if len(records) == 0:
+            return
+        if np.any(np.diff(records['date']) <= 0):
+            raise ValueError(f'{station}: dates must be strictly increasing')
+        existing = self.records(station)
+        if len(existing) and records['date'][0] <= existing['date'][-1]:
+            raise ValueError(f'{station}: {to_dates(records["date"][0])} is not after the '
+                             f'last stored day {to_dates(existing["date"][-1])}')
+        with open(self.path(station), 'ab') as f:
+            f.write(records.tobytes())
+
+    def records(self, station, start=None, end=None):
+        """Mapped records with start <= date <= end (a view, nothing is copied)."""
+        if self.count(station) == 0:
+            return np.empty(0, dtype=RECORD)
+        records = np.memmap(self.path(station), dtype=RECORD, mode='r')
+        dates = records['date']
+        lo = 0 if start is None else np.searchsorted(dates, to_days(start), side='left')
+        hi = len(records) if end is None else np.searchsorted(dates, to_days(end), side='right')
+        return records[lo:hi]
+
+    def to_frame(self, station, start=None, end=None):
+        """The records as a regular DataFrame (this one does copy)."""
+        records = self.records(station, start, end)
+        df = pd.DataFrame({col: records[col].astype(np.float64) for col in COLUMNS[1:]})
+        df.insert(0, 'date', pd.to_datetime(to_dates(records['date'])))
+        return df
+
+
+# Task 3 / Task 5 statistics on mapped records
+
+def _moments(records, column, key_fn, groups):
+    """Per-group rows, n, mean, M2, min and max of one column, one block at a time.
+
+    Blocks are combined with Chan's parallel update, so memory stays at one
+    block of temporaries however long the archive is. Missing (NaN) values
+    count towards `rows` but are otherwise skipped, like pandas does; a
+    group without valid values has NaN mean, min and max.
+    """
+    rows = np.zeros(groups, dtype=np.int64)
+    n = np.zeros(groups)
+    mean = np.zeros(groups)
+    m2 = np.zeros(groups)
+    lo = np.full(groups, np.inf)
+    hi = np.full(groups, -np.inf)
+    for start in range(0, len(records), BLOCK):
+        block = records[start:start + BLOCK]
+        keys = key_fn(block['date'])
+        x = block[column].astype(np.float64)
+        rows += np.bincount(keys, minlength=groups)
+        valid = np.isfinite(x)
+        keys, x = keys[valid], x[valid]
+        bn = np.bincount(keys, minlength=groups).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            bmean = np.bincount(keys, weights=x, minlength=groups) / bn
+            bm2 = np.bincount(keys, weights=(x - bmean[keys]) ** 2, minlength=groups)
+            total = n + bn
+            delta = np.nan_to_num(bmean) - mean
+            mean = np.where(total > 0, mean + delta * bn / np.maximum(total, 1), 0.0)
+            m2 = m2 + bm2 + delta ** 2 * n * bn / np.maximum(total, 1)
+        n = total
+        np.minimum.at(lo, keys, x)
+        np.maximum.at(hi, keys, x)
+    empty = n == 0
+    mean[empty] = lo[empty] = hi[empty] = np.nan
+    return rows, n, mean, m2, lo, hi
+
+
+def _month0(days):
+    return to_dates(days).astype('datetime64[M]').astype(np.int64) % 12
+
+
+def _week_end(days):
+    days = np.asarray(days, dtype=np.int64)
+    return days + (6 - (days + 3) % 7)  # 1970-01-01 was a Thursday
+
+
+def _std(n, m2, ddof):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.sqrt(m2 / (n - ddof))
+
+
+def _sum(n, mean):
+    return np.where(n > 0, mean * n, 0.0)  # pandas sums an all-NaN group to 0
+
+
+def daily_stats(records):
+    _, n, mean, m2, lo, hi = _moments(records, 'temperature_c', lambda d: np.zeros(len(d), np.int64), 1)
+    return {
+        'mean_temp': mean[0],
+        'min_temp': lo[0],
+        'max_temp': hi[0],
+        'std_temp': _std(n, m2, 0)[0]
+    }
+
+
+def monthly_rain(records):
+    rows, n, mean, m2, lo, hi = _moments(records, 'rainfall_mm', _month0, 12)
+    seen = rows > 0
+    return pd.DataFrame({
+        'mean': mean[seen], 'sum': _sum(n, mean)[seen], 'min': lo[seen], 'max': hi[seen],
+        'std': _std(n, m2, 1)[seen],
+    }, index=pd.Index(np.arange(1, 13)[seen], name='date'))
+
+
+def seasonal_stats(records):
+    table = {}
+    for col in ['temperature_c', 'rainfall_mm', 'humidity_percent']:
+        rows, n, mean, m2, _, _ = _moments(records, col, lambda d: _month0(d) // 3, 4)
+        seen = rows > 0
+        table[(col, 'mean')] = mean[seen]
+        table[(col, 'std')] = _std(n, m2, 1)[seen]
+    labels = pd.CategoricalIndex(np.array(SEASON_LABELS)[seen], categories=SEASON_LABELS,
+                                 ordered=True, name='season')
+    return pd.DataFrame(table, index=labels)
+
+
+def monthly_stats(records):
+    table = {}
+    for col in ['temperature_c', 'rainfall_mm']:
+        rows, n, mean, _, _, _ = _moments(records, col, _month0, 12)
+        seen = rows > 0
+        table[(col, 'mean')] = mean[seen]
+        table[(col, 'sum')] = _sum(n, mean)[seen]
+    return pd.DataFrame(table, index=pd.Index(np.arange(1, 13)[seen], name='month'))
+
+
+def weekly_temp(records):
+    if len(records) == 0:
+        return pd.DataFrame(columns=['mean', 'max', 'min'])
+    first = _week_end(records['date'][:1])[0]
+    weeks = (_week_end(records['date'][-1:])[0] - first) // 7 + 1
+    rows, _, mean, _, lo, hi = _moments(records, 'temperature_c', lambda d: (_week_end(d) - first) // 7, weeks)
+    seen = rows > 0
+    index = pd.DatetimeIndex(to_dates(first + 7 * np.flatnonzero(seen)), name='date')
+    return pd.DataFrame({'mean': mean[seen], 'max': hi[seen], 'min': lo[seen]}, index=index)
+
+
+def analyze(records):
+    """weather_visualizer.analyze() computed straight from mapped records."""
+    return {
+        'daily_stats': daily_stats(records),
+        'monthly_rain': monthly_rain(records),
+        'seasonal_stats': seasonal_stats(records),
+        'monthly_stats': monthly_stats(records),
+        'weekly_temp': weekly_temp(records),
+    }
@@ -0,0 +1,276 @@
+# weather_stream.py
+# Streaming statistics for live station feeds.
+#
+# Every accumulator here updates in O(1) per observation and keeps O(1)
+# state (the rolling window keeps its last `size` values), so a feed can be
+# followed day by day without ever recomputing over its history:
+#   Moments  - Welford running count / mean / variance / min / max
+#   Rolling  - mean and variance over the last `size` observations
+#   Ewma     - exponentially weighted mean and variance
+# StationStream combines them per variable and flags z-score anomalies.
+# weather_visualizer.daily_stats() / seasonal_stats() are built on Moments.
+# Missing (NaN) and infinite values are skipped by every accumulator, like
+# the pandas reductions they replace.
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from weather_schema import SEASON_LABELS, VARIABLES
+
+
+def season_index(month):
+    """0-3 for the SEASON_LABELS quarter a month (1-12) falls in."""
+    return (np.asarray(month) - 1) // 3
+
+
+class Moments:
+    """Running n, mean, M2 (sum of squared deviations), min and max."""
+    __slots__ = ('n', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.n = 0
+        self.mean = self.min = self.max = np.float64(np.nan)
+        self.m2 = np.float64(0.0)
+
+    def add(self, x):
+        """Welford's update for one observation."""
+        x = np.float64(x)
+        if not np.isfinite(x):
+            return
+        self.n += 1
+        if self.n == 1:
+            self.mean = self.min = self.max = x
+            return
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def merge(self, other):
+        """Folds another Moments in (Chan et al. parallel combination)."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2, self.min, self.max = other.n, other.mean, other.m2, other.min, other.max
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def extend(self, values):
+        """Adds a batch of observations with one vectorized pass."""
+        return self.merge(Moments.of(values))
+
+    @classmethod
+    def of(cls, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        moments = cls()
+        if len(values):
+            moments.n = len(values)
+            moments.mean = np.mean(values)
+            moments.m2 = np.sum((values - moments.mean) ** 2)
+            moments.min = np.min(values)
+            moments.max = np.max(values)
+        return moments
+
+    @classmethod
+    def grouped(cls, values, keys, groups):
+        """One Moments per group 0..groups-1 of `values`."""
+        values = np.asarray(values, dtype=np.float64)
+        valid = np.isfinite(values)
+        values, keys = values[valid], np.asarray(keys)[valid]
+        return [cls.of(values[keys == g]) for g in range(groups)]
+
+    def var(self, ddof=1):
+        return self.m2 / (self.n - ddof) if self.n > ddof else np.float64(np.nan)
+
+    def std(self, ddof=1):
+        return np.sqrt(self.var(ddof))
+
+
+class Rolling:
+    """Mean and variance of the last `size` observations.
+
+    Adding a value when the window is full first removes the oldest one
+    with the inverse Welford update, so each step is O(1).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def __len__(self):
+        return len(self.values)
+
+    def add(self, x):
+        x = float(x)
+        if not math.isfinite(x):
+            return
+        if len(self.values) == self.size:
+            old = self.values.popleft()
+            n = len(self.values)
+            if n == 0:
+                self.mean = self.m2 = 0.0
+            else:
+                mean = self.mean - (old - self.mean) / n
+                self.m2 -= (old - self.mean) * (old - mean)
+                self.mean = mean
+        self.values.append(x)
+        delta = x - self.mean
+        self.mean += delta / len(self.values)
+        self.m2 = max(self.m2 + delta * (x - self.mean), 0.0)  # clamp rounding drift
+
+    def var(self, ddof=1):
+        n = len(self.values)
+        return self.m2 / (n - ddof) if n > ddof else math.nan
+
+    def std(self, ddof=1):
+        return math.sqrt(self.var(ddof))
+
+
+class Ewma:
+    """Exponentially weighted mean and variance with smoothing factor `alpha`."""
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.mean = math.nan
+        self.var = 0.0
+
+    def add(self, x):
+        x = float(x)
+        if not math.isfinite(x):
+            return
+        if math.isnan(self.mean):
+            self.mean = x
+            return
+        delta = x - self.mean
+        step = self.alpha * delta
+        self.mean += step
+        self.var = (1 - self.alpha) * (self.var + delta * step)
+
+    def std(self):
+        return math.sqrt(self.var)
+
+
+class VariableStream:
+    """All accumulators for one weather variable."""
+
+    def __init__(self, window, alpha):
+        self.total = Moments()
+        self.seasons = [Moments() for _ in range(4)]
+        self.rolling = Rolling(window)
+        self.ewma = Ewma(alpha)
+        self.z = math.nan
+
+    def add(self, x, season):
+        """Adds one value; its z-score is taken against the window before it."""
+        std = self.rolling.std()
+        self.z = (x - self.rolling.mean) / std if std > 0 else math.nan
+        self.total.add(x)
+        self.seasons[season].add(x)
+        self.rolling.add(x)
+        self.ewma.add(x)
+        return self.z
+
+
+class StationStream:
+    """Streaming statistics for one station's daily observations.
+
+    Feed observations in date order with update(); daily_stats() and
+    seasonal_stats() are then available at any time, matching
+    weather_visualizer.daily_stats() / seasonal_stats() of everything fed
+    so far. A value is flagged as an anomaly when it is more than
+    `threshold` rolling standard deviations from the rolling mean of the
+    previous `window` observations (once `min_periods` have been seen).
+    The object pickles, so a feed can be resumed after a restart.
+    """
+
+    def __init__(self, window=30, alpha=0.1, threshold=3.0, min_periods=7):
+        self.window = window
+        self.threshold = threshold
+        self.min_periods = min_periods
+        self.variables = {var: VariableStream(window, alpha) for var in VARIABLES}
+        self.last_date = None
+
+    def __getitem__(self, var):
+        return self.variables[var]
+
+    def update(self, date, **values):
+        """Adds one day (values keyed by VARIABLES); returns the anomalous variables."""
+        date = pd.Timestamp(date)
+        season = int(season_index(date.month))
+        anomalies = []
+        for var, stream in self.variables.items():
+            ready = len(stream.rolling) >= self.min_periods
+            z = stream.add(values[var], season)
+            if ready and abs(z) > self.threshold:
+                anomalies.append(var)
+        self.last_date = date
+        return anomalies
+
+    def feed(self, df):
+        """update() for every row of a frame; yields (date, anomalies) per row."""
+        for row in df[['date'] + VARIABLES].itertuples(index=False):
+            yield row.date, self.update(row.date, **{var: getattr(row, var) for var in VARIABLES})
+
+    def daily_stats(self):
+        return daily_stats(self['temperature_c'].total)
+
+    def seasonal_stats(self):
+        return seasonal_stats({var: self[var].seasons for var in ['temperature_c', 'rainfall_mm', 'humidity_percent']})
+
+
+def daily_stats(moments):
+    """The weather_visualizer.daily_stats() dict from temperature Moments."""
+    return {
+        'mean_temp': moments.mean,
+        'min_temp': moments.min,
+        'max_temp': moments.max,
+        'std_temp': moments.std(ddof=0)
+    }
+
+
+def seasonal_stats(seasons):
+    """The weather_visualizer.seasonal_stats() table from {variable: [Moments per season]}."""
+    table = {}
+    for var, moments in seasons.items():
+        table[(var, 'mean')] = [m.mean for m in moments]
+        table[(var, 'std')] = [m.std() for m in moments]
+    index = pd.CategoricalIndex(SEASON_LABELS, categories=SEASON_LABELS, ordered=True, name='season')
+    return pd.DataFrame(table, index=index)
+
+
+def annotate(df, window=30, alpha=0.1, threshold=3.0, min_periods=7):
+    """Copy of a cleaned frame with rolling mean / std, EWMA, z-score and
+    anomaly columns per variable, computed by streaming it through a
+    StationStream."""
+    stream = StationStream(window, alpha, threshold, min_periods)
+    columns = {f'{var}_{stat}': np.empty(len(df)) for var in VARIABLES
+               for stat in ['rolling_mean', 'rolling_std', 'ewma', 'z']}
+    flags = {var: np.zeros(len(df), dtype=bool) for var in VARIABLES}
+    for i, (_, anomalies) in enumerate(stream.feed(df)):
+        for var in VARIABLES:
+            s = stream[var]
+            columns[f'{var}_rolling_mean'][i] = s.rolling.mean
+            columns[f'{var}_rolling_std'][i] = s.rolling.std()
+            columns[f'{var}_ewma'][i] = s.ewma.mean
+            columns[f'{var}_z'][i] = s.z
+        for var in anomalies:
+            flags[var][i] = True
+    out = df.copy()
+    for var in VARIABLES:
+        for stat in ['rolling_mean', 'rolling_std', 'ewma', 'z']:
+            out[f'{var}_{stat}'] = columns[f'{var}_{stat}']
+        out[f'{var}_anomaly'] = flags[var]
+    return out